@@ -1,8 +1,16 @@
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # No banner on import
+
 import pygame
 import random
 import math
 import time
 import subprocess
+import argparse
+from collections import defaultdict
+from contextlib import contextmanager
+
+import numpy as np
 
 WIDTH, HEIGHT = 800, 600
 
@@ -19,10 +27,28 @@ ALIGNMENT_WEIGHT = 1.0
 COHESION_WEIGHT = 1.0
 SEPARATION_WEIGHT = 1.0
 
-pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Boids Flocking Simulation")
-clock = pygame.time.Clock()
+PARAMETERS = ("WIDTH", "HEIGHT", "NUM_BOIDS", "BOID_RADIUS", "MAX_SPEED", "STEERING",
+              "NEIGHBOR_RADIUS", "AVOID_RADIUS", "FOV_ANGLE",
+              "ALIGNMENT_WEIGHT", "COHESION_WEIGHT", "SEPARATION_WEIGHT")
+
+
+@contextmanager
+def parameters(**overrides):
+    """Temporarily replace module constants, e.g. ``parameters(ALIGNMENT_WEIGHT=0.5)``."""
+    unknown = set(overrides) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {sorted(unknown)}")
+    previous = {name: globals()[name] for name in overrides}
+    globals().update(overrides)
+    try:
+        yield
+    finally:
+        globals().update(previous)
+
+
+def interaction_radius():
+    """Distance beyond which no rule looks at another boid."""
+    return max(NEIGHBOR_RADIUS, AVOID_RADIUS)
 
 class Boid:
     def __init__(self, x, y):
@@ -30,18 +56,8 @@ class Boid:
         self.velocity = pygame.Vector2(random.uniform(-2, 2), random.uniform(-2, 2))
 
     def update(self, boids):
-        separation = self.separate(boids)
-        alignment = self.align(boids)
-        cohesion = self.cohere(boids)
-
-        steering = (alignment * ALIGNMENT_WEIGHT +
-                    cohesion * COHESION_WEIGHT +
-                    separation * SEPARATION_WEIGHT)
-
-        if steering.length() > STEERING:
-            steering.scale_to_length(STEERING)
-
-        self.velocity += steering
+        """Steer using the candidate neighbours in ``boids`` (the whole flock or a SpatialHash query)."""
+        self.velocity += self.steering(boids)
 
         if self.velocity.length() > MAX_SPEED:
             self.velocity.scale_to_length(MAX_SPEED)
@@ -57,54 +73,269 @@ class Boid:
         if self.position.y < 0:
             self.position.y = HEIGHT
 
+    def steering(self, boids):
+        """Combined, clamped steering vector from the candidate neighbours in ``boids``."""
+        neighbours = self.neighbours(boids)
+        separation = self.separate(neighbours)
+        alignment = self.align(neighbours)
+        cohesion = self.cohere(neighbours)
+
+        steering = (alignment * ALIGNMENT_WEIGHT +
+                    cohesion * COHESION_WEIGHT +
+                    separation * SEPARATION_WEIGHT)
+
+        if steering.length() > STEERING:
+            steering.scale_to_length(STEERING)
+        return steering
+
     def in_field_of_view(self, other):
         direction_to_other = (other.position - self.position).normalize()
         forward_direction = self.velocity.normalize()
         angle = forward_direction.angle_to(direction_to_other)
         return abs(angle) < (FOV_ANGLE / 2)
 
-    def align(self, boids):
+    def neighbours(self, boids):
+        """Boids within ``interaction_radius()`` and in the field of view, with their distances.
+
+        Each rule then keeps the ones within its own radius.
+        """
+        radius = interaction_radius()
+        found = []
+        for boid in boids:
+            if boid is not self:
+                distance = self.position.distance_to(boid.position)
+                if distance < radius and self.in_field_of_view(boid):
+                    found.append((boid, distance))
+        return found
+
+    def align(self, neighbours):
         """Calculate alignment vector."""
         avg_velocity = pygame.Vector2(0, 0)
         count = 0
-        for boid in boids:
-            if boid != self:
-                if self.in_field_of_view(boid):
-                    distance = self.position.distance_to(boid.position)
-                    if distance < NEIGHBOR_RADIUS:
-                        avg_velocity += boid.velocity
-                        count += 1
+        for boid, distance in neighbours:
+            if distance < NEIGHBOR_RADIUS:
+                avg_velocity += boid.velocity
+                count += 1
         if count > 0:
             avg_velocity /= count
             avg_velocity = avg_velocity - self.velocity
         return avg_velocity
 
-    def cohere(self, boids):
+    def cohere(self, neighbours):
         """Calculate cohesion vector."""
         center_of_mass = pygame.Vector2(0, 0)
         count = 0
-        for boid in boids:
-            if boid != self and self.in_field_of_view(boid):
-                distance = self.position.distance_to(boid.position)
-                if distance < NEIGHBOR_RADIUS:
-                    center_of_mass += boid.position
-                    count += 1
+        for boid, distance in neighbours:
+            if distance < NEIGHBOR_RADIUS:
+                center_of_mass += boid.position
+                count += 1
         if count > 0:
             center_of_mass /= count
             return (center_of_mass - self.position) * 0.01
         return pygame.Vector2(0, 0)
 
-    def separate(self, boids):
+    def separate(self, neighbours):
         """Calculate separation vector."""
         avoid_vector = pygame.Vector2(0, 0)
-        for boid in boids:
-            if boid != self and self.in_field_of_view(boid):
-                distance = self.position.distance_to(boid.position)
-                if distance < AVOID_RADIUS:
-                    avoid_vector += (self.position - boid.position) / distance
+        for boid, distance in neighbours:
+            if distance < AVOID_RADIUS:
+                avoid_vector += (self.position - boid.position) / distance
         return avoid_vector
 
-boids = [Boid(random.uniform(0, WIDTH), random.uniform(0, HEIGHT)) for _ in range(NUM_BOIDS)]
+
+class SpatialHash:
+    """Uniform grid of cells at least ``interaction_radius()`` + MAX_SPEED wide, rebuilt each frame.
+
+    Boids keep moving while the frame is updated, so cells carry a MAX_SPEED
+    margin, and the grid wraps around the edges like the boid positions do.
+    Together this makes ``nearby`` return every boid that can be within
+    NEIGHBOR_RADIUS or AVOID_RADIUS of the queried boid at any point during
+    the frame.
+    """
+
+    def __init__(self, boids, cell_size=None):
+        if cell_size is None:
+            cell_size = interaction_radius() + MAX_SPEED
+        self.cols = max(1, int(WIDTH // cell_size))
+        self.rows = max(1, int(HEIGHT // cell_size))
+        self.cell_width = WIDTH / self.cols
+        self.cell_height = HEIGHT / self.rows
+        self.cells = defaultdict(list)
+        for boid in boids:
+            self.cells[self.cell_of(boid.position)].append(boid)
+
+    def cell_of(self, position):
+        return (int(position.x // self.cell_width) % self.cols,
+                int(position.y // self.cell_height) % self.rows)
+
+    def nearby(self, boid):
+        """Boids in the 3x3 block of cells around ``boid``."""
+        col, row = self.cell_of(boid.position)
+        cells = {((col + dc) % self.cols, (row + dr) % self.rows)
+                 for dc in (-1, 0, 1) for dr in (-1, 0, 1)}
+        return [other for cell in cells for other in self.cells.get(cell, ())]
+
+class FlockArrays:
+    """Structure-of-arrays flock: positions and velocities are (N, 2) NumPy arrays.
+
+    ``step`` applies the same separation, alignment, cohesion, field-of-view,
+    speed clamping and wrap-around rules as ``Boid.update``, but to all boids
+    at once from the positions and velocities at the start of the step
+    (``Boid.update`` moves boids one after another within a frame).
+    Neighbour candidates come from a cell list, and pairs are processed
+    ``chunk_size`` boids at a time so memory stays bounded for large N.
+    """
+
+    def __init__(self, positions, velocities):
+        self.positions = np.array(positions, dtype=float).reshape(-1, 2)
+        self.velocities = np.array(velocities, dtype=float).reshape(-1, 2)
+
+    @classmethod
+    def random(cls, n, rng=None):
+        rng = np.random.default_rng(rng)
+        positions = rng.uniform((0, 0), (WIDTH, HEIGHT), size=(n, 2))
+        velocities = rng.uniform(-2, 2, size=(n, 2))
+        return cls(positions, velocities)
+
+    @classmethod
+    def from_boids(cls, boids):
+        return cls([tuple(b.position) for b in boids], [tuple(b.velocity) for b in boids])
+
+    def neighbour_pairs(self, chunk_size=4096):
+        """Sort the flock by cell and find all pairs closer than ``interaction_radius()``.
+
+        Returns ``order``, the boid indices sorted by cell, and a generator
+        of ``(first, last, i, j, dx, dy, distance)`` chunks in which ``i`` and
+        ``j`` are positions in ``order`` and ``first <= i < last``.
+        """
+        n = len(self.positions)
+        radius = interaction_radius()
+        cols = int(WIDTH // radius)
+        rows = int(HEIGHT // radius)
+        offsets = [(dc, dr) for dc in (-1, 0, 1) for dr in (-1, 0, 1)]
+        if cols < 3 or rows < 3:  # Adjacent cells would repeat, use one cell
+            cols, rows, offsets = 1, 1, [(0, 0)]
+
+        # Sort boids by cell so each cell is a contiguous index range
+        col = (self.positions[:, 0] // (WIDTH / cols)).astype(int) % cols
+        row = (self.positions[:, 1] // (HEIGHT / rows)).astype(int) % rows
+        cell = row * cols + col
+        order = np.argsort(cell, kind="stable")
+        cell, col, row = cell[order], col[order], row[order]
+        x, y = self.positions[order, 0], self.positions[order, 1]
+        starts = np.searchsorted(cell, np.arange(cols * rows))
+        ends = np.searchsorted(cell, np.arange(cols * rows), side="right")
+        offsets = np.array(offsets)
+
+        def chunks():
+            for first in range(0, n, chunk_size):
+                last = min(first + chunk_size, n)
+
+                # Candidate pairs: every boid in the same or an adjacent cell
+                near = (((row[first:last, None] + offsets[:, 1]) % rows) * cols
+                        + (col[first:last, None] + offsets[:, 0]) % cols).ravel()
+                counts = ends[near] - starts[near]
+                i = np.repeat(np.repeat(np.arange(first, last), len(offsets)), counts)
+                shift = np.repeat(starts[near] - (np.cumsum(counts) - counts), counts)
+                j = shift + np.arange(counts.sum())
+
+                dx, dy = x[j] - x[i], y[j] - y[i]
+                distance = np.hypot(dx, dy)
+                keep = (i != j) & (distance > 0) & (distance < radius)
+                yield first, last, i[keep], j[keep], dx[keep], dy[keep], distance[keep]
+
+        return order, chunks()
+
+    def steering(self, chunk_size=4096):
+        """Combined, clamped steering vector of every boid."""
+        order, chunks = self.neighbour_pairs(chunk_size)
+        x, y = self.positions[order, 0], self.positions[order, 1]
+        vx, vy = self.velocities[order, 0], self.velocities[order, 1]
+
+        steering = np.zeros((len(order), 2))
+        for first, last, i, j, dx, dy, distance in chunks:
+            size = last - first
+            # pygame's angle_to is a plain difference of atan2 angles, not
+            # wrapped into [-180, 180], so the same is done here.
+            angle = np.degrees(np.arctan2(dy, dx) - np.arctan2(vy[i], vx[i]))
+            keep = np.abs(angle) < FOV_ANGLE / 2
+            i, j, dx, dy, distance = i[keep], j[keep], dx[keep], dy[keep], distance[keep]
+            local = i - first
+            near = distance < NEIGHBOR_RADIUS
+
+            def total(values, mask=near):
+                return np.bincount(local, weights=np.where(mask, values, 0), minlength=size)
+
+            count = np.bincount(local[near], minlength=size)
+            has = count > 0
+            count = np.maximum(count, 1)
+            alignment = np.stack([np.where(has, total(vx[j]) / count - vx[first:last], 0),
+                                  np.where(has, total(vy[j]) / count - vy[first:last], 0)], axis=1)
+            cohesion = np.stack([np.where(has, (total(x[j]) / count - x[first:last]) * 0.01, 0),
+                                 np.where(has, (total(y[j]) / count - y[first:last]) * 0.01, 0)], axis=1)
+            avoid = distance < AVOID_RADIUS
+            separation = np.stack([total(-dx / distance, avoid),
+                                   total(-dy / distance, avoid)], axis=1)
+
+            steering[order[first:last]] = (alignment * ALIGNMENT_WEIGHT +
+                                           cohesion * COHESION_WEIGHT +
+                                           separation * SEPARATION_WEIGHT)
+
+        return clamp_length(steering, STEERING)
+
+    def order_parameters(self, chunk_size=4096):
+        """Polarization, mean neighbour count and mean nearest-neighbour distance.
+
+        Neighbours are boids closer than NEIGHBOR_RADIUS, regardless of the
+        field of view.
+        """
+        n = len(self.positions)
+        speed = np.hypot(self.velocities[:, 0], self.velocities[:, 1])
+        heading = self.velocities / np.maximum(speed, 1e-300)[:, None]
+        polarization = float(np.hypot(*heading.mean(axis=0))) if n else 0.0
+
+        order, chunks = self.neighbour_pairs(chunk_size)
+        neighbours = np.zeros(n, dtype=int)
+        nearest = np.full(n, np.inf)
+        for first, last, i, j, dx, dy, distance in chunks:
+            near = distance < NEIGHBOR_RADIUS
+            neighbours[first:last] = np.bincount(i[near] - first, minlength=last - first)
+            np.minimum.at(nearest, i, distance)
+
+        # Boids with no neighbour in range need a search over the whole flock
+        for k in np.flatnonzero(np.isinf(nearest)):
+            distance = np.hypot(*(self.positions - self.positions[order[k]]).T)
+            distance = distance[distance > 0]
+            if distance.size:
+                nearest[k] = distance.min()
+
+        return {
+            "polarization": polarization,
+            "mean_neighbours": float(neighbours.mean()) if n else 0.0,
+            "nearest_neighbour": float(nearest[np.isfinite(nearest)].mean())
+            if np.isfinite(nearest).any() else float("nan"),
+        }
+
+    def step(self, chunk_size=4096):
+        self.velocities = clamp_length(self.velocities + self.steering(chunk_size), MAX_SPEED)
+        self.positions += self.velocities
+
+        x, y = self.positions[:, 0], self.positions[:, 1]
+        x[x > WIDTH] = 0
+        x[x < 0] = WIDTH
+        y[y > HEIGHT] = 0
+        y[y < 0] = HEIGHT
+
+
+def clamp_length(vectors, max_length):
+    """Scale down rows of ``vectors`` that are longer than ``max_length``."""
+    length = np.hypot(vectors[:, 0], vectors[:, 1])
+    scale = np.where(length > max_length, max_length / np.maximum(length, 1e-300), 1.0)
+    return vectors * scale[:, None]
+
+
+ORDER_PARAMETERS = ("polarization", "mean_neighbours", "nearest_neighbour")
+
 
 def draw_arrow(screen, color, position, velocity, size=10):
     angle = math.atan2(-velocity.y, velocity.x)
@@ -117,19 +348,139 @@ def draw_arrow(screen, color, position, velocity, size=10):
     ]
     pygame.draw.polygon(screen, color, points)
 
-running = True
-while running:
-    screen.fill((30, 30, 30))
 
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
+class Renderer:
+    """Observer for ``run_headless`` that draws every ``every``-th step in a pygame window.
+
+    Returns False once the window is closed, which stops the run.
+    """
+
+    def __init__(self, every=1, fps=None):
+        self.every = every
+        self.fps = fps
+        pygame.init()
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Boids Flocking Simulation")
+        self.clock = pygame.time.Clock()
+
+    def __call__(self, step, flock):
+        if step % self.every:
+            return True
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                return False
+
+        self.screen.fill((30, 30, 30))
+        for position, velocity in zip(flock.positions, flock.velocities):
+            draw_arrow(self.screen, (255, 255, 255), pygame.Vector2(*position),
+                       pygame.Vector2(*velocity), BOID_RADIUS)
+        pygame.display.flip()
+        if self.fps:
+            self.clock.tick(self.fps)
+        return True
+
+
+def run_headless(steps, num_boids=None, seed=None, engine="arrays", observer=None, **params):
+    """Run the simulation for ``steps`` steps as fast as possible, without a window.
+
+    ``engine`` is "arrays" (FlockArrays, all boids move at once) or "boids"
+    (Boid objects updated one after another, as in the interactive mode).
+    Keyword arguments override module constants for this run only, e.g.
+    ``run_headless(1000, ALIGNMENT_WEIGHT=0.5)``. ``observer(step, flock)``
+    is called after every step and can stop the run by returning False.
+    Returns the final FlockArrays and a dict of per-step order parameters.
+    """
+    with parameters(**params):
+        num_boids = NUM_BOIDS if num_boids is None else num_boids
+        if engine == "arrays":
+            flock = FlockArrays.random(num_boids, seed)
+        elif engine == "boids":
+            random.seed(seed)
+            boids = [Boid(random.uniform(0, WIDTH), random.uniform(0, HEIGHT))
+                     for _ in range(num_boids)]
+        else:
+            raise ValueError(f"Unknown engine: {engine}")
+
+        history = {name: [] for name in ORDER_PARAMETERS}
+        for step in range(steps):
+            if engine == "arrays":
+                flock.step()
+            else:
+                grid = SpatialHash(boids)
+                for boid in boids:
+                    boid.update(grid.nearby(boid))
+                flock = FlockArrays.from_boids(boids)
+
+            for name, value in flock.order_parameters().items():
+                history[name].append(value)
+            if observer is not None and observer(step, flock) is False:
+                break
+
+    return flock, {name: np.array(values) for name, values in history.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Boids flocking simulation")
+    parser.add_argument("--headless", action="store_true",
+                        help="run a fixed number of steps without a window")
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--boids", type=int, default=NUM_BOIDS)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--engine", choices=("arrays", "boids"), default="arrays")
+    parser.add_argument("--render", action="store_true",
+                        help="draw the headless run in a window")
+    parser.add_argument("--output", default="order_parameters.csv")
+    parser.add_argument("--record", metavar="PATH", help="save the headless run as a trajectory file")
+    parser.add_argument("--record-every", type=int, default=1, help="keep every n-th step in the recording")
+    args = parser.parse_args()
+
+    if args.headless:
+        from trajectory import TrajectoryRecorder
+
+        observers = []
+        if args.render:
+            observers.append(Renderer())
+        if args.record:
+            observers.append(TrajectoryRecorder(args.record, args.boids, args.record_every,
+                                                width=WIDTH, height=HEIGHT))
+
+        def observer(step, flock):
+            return all([observe(step, flock) is not False for observe in observers])
+
+        _, history = run_headless(args.steps, args.boids, args.seed, args.engine, observer)
+        for observe in observers:
+            if isinstance(observe, TrajectoryRecorder):
+                observe.close()
+        np.savetxt(args.output, np.column_stack([history[name] for name in ORDER_PARAMETERS]),
+                   delimiter=",", header=",".join(ORDER_PARAMETERS), comments="")
+        return
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Boids Flocking Simulation")
+    clock = pygame.time.Clock()
+
+    boids = [Boid(random.uniform(0, WIDTH), random.uniform(0, HEIGHT)) for _ in range(args.boids)]
+
+    running = True
+    while running:
+        screen.fill((30, 30, 30))
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+        grid = SpatialHash(boids)
+        for boid in boids:
+            boid.update(grid.nearby(boid))
+            draw_arrow(screen, (255, 255, 255), boid.position, boid.velocity, BOID_RADIUS)
+
+        pygame.display.flip()
+        clock.tick(60)
 
-    for boid in boids:
-        boid.update(boids)
-        draw_arrow(screen, (255, 255, 255), boid.position, boid.velocity, BOID_RADIUS)
+    pygame.quit()
 
-    pygame.display.flip() 
-    clock.tick(60)  
 
-pygame.quit()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from main import ORDER_PARAMETERS, PARAMETERS, run_headless
+
+
+def expand_grid(grid):
+    """All combinations of a ``{name: [values]}`` grid, as a list of dicts."""
+    unknown = set(grid) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {sorted(unknown)}")
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def run_seed(seed, index, replicate):
+    """Independent seed for one run, derived from the sweep seed and the run's position."""
+    return int(np.random.SeedSequence([seed, index, replicate]).generate_state(1)[0])
+
+
+def summarize(task):
+    """Run one grid point and reduce its order parameters to summary statistics.
+
+    Means and standard deviations are taken over the second half of the run,
+    after the flock has had time to settle.
+    """
+    index, replicate, seed, params, steps, num_boids, engine = task
+    # A NUM_BOIDS grid value sets the flock size in place of ``num_boids``
+    num_boids = int(params.get("NUM_BOIDS", num_boids))
+    _, history = run_headless(steps, num_boids, seed, engine, **params)
+    row = {"index": index, "replicate": replicate, "seed": seed, **params}
+    for name in ORDER_PARAMETERS:
+        values = history[name]
+        settled = values[len(values) // 2:]
+        row[f"{name}_mean"] = float(np.mean(settled)) if len(settled) else float("nan")
+        row[f"{name}_std"] = float(np.std(settled)) if len(settled) else float("nan")
+        row[f"{name}_final"] = float(values[-1]) if len(values) else float("nan")
+    return row
+
+
+def settings_filename(output):
+    return f"{output}.settings.json"
+
+
+def check_settings(output, settings):
+    """Record the settings of a new sweep next to ``output``, or check them when resuming.
+
+    Completed runs are only identified by their grid index and replicate, so
+    resuming with a different grid, seed, step count, flock size or engine
+    would mix unrelated runs; that raises a ValueError instead.
+    """
+    path = settings_filename(output)
+    settings = json.loads(json.dumps(settings))  # As it reads back from the file
+    if os.path.exists(output) and os.path.getsize(output) > 0:
+        if not os.path.exists(path):
+            raise ValueError(f"{output} cannot be resumed without its sweep settings in {path}")
+        with open(path) as file:
+            recorded = json.load(file)
+        changed = sorted(name for name in settings.keys() | recorded.keys()
+                         if settings.get(name) != recorded.get(name))
+        if changed:
+            raise ValueError(f"{output} belongs to a sweep with different {', '.join(changed)}")
+    else:
+        with open(path, "w") as file:
+            json.dump(settings, file, indent=2)
+
+
+def completed_runs(output):
+    """(index, replicate) pairs already in the results file, which doubles as the checkpoint."""
+    if not os.path.exists(output):
+        return set()
+    # Drop a row left half-written by an interrupted sweep
+    with open(output, "rb+") as file:
+        content = file.read()
+        if content and not content.endswith(b"\n"):
+            file.truncate(content.rfind(b"\n") + 1)
+    with open(output, newline="") as file:
+        return {(int(row["index"]), int(row["replicate"])) for row in csv.DictReader(file)}
+
+
+def run_sweep(grid, output, steps=1000, num_boids=100, replicates=1, seed=0,
+              engine="arrays", workers=None):
+    """Run every grid point ``replicates`` times across a process pool.
+
+    One row per finished run is appended to the CSV file ``output`` as soon
+    as it completes. Runs already in the file are skipped, so an interrupted
+    sweep resumes where it stopped when called again with the same arguments;
+    only ``replicates`` and ``workers`` may differ (see ``check_settings``).
+    """
+    points = expand_grid(grid)
+    check_settings(output, {"grid": grid, "steps": steps, "num_boids": num_boids,
+                            "seed": seed, "engine": engine})
+    done = completed_runs(output)
+    tasks = [(index, replicate, run_seed(seed, index, replicate), params, steps, num_boids, engine)
+             for index, params in enumerate(points)
+             for replicate in range(replicates)
+             if (index, replicate) not in done]
+
+    columns = (["index", "replicate", "seed"] + sorted(grid)
+               + [f"{name}_{stat}" for name in ORDER_PARAMETERS for stat in ("mean", "std", "final")])
+    write_header = not os.path.exists(output) or os.path.getsize(output) == 0
+
+    with open(output, "a", newline="") as file, ProcessPoolExecutor(max_workers=workers) as executor:
+        writer = csv.DictWriter(file, fieldnames=columns)
+        if write_header:
+            writer.writeheader()
+        futures = [executor.submit(summarize, task) for task in tasks]
+        for finished, future in enumerate(as_completed(futures), start=1):
+            writer.writerow(future.result())
+            file.flush()
+            print(f"{finished}/{len(tasks)} runs done ({len(done)} already in {output})")
+
+
+def parse_value(value):
+    """An int when ``value`` is written as one (e.g. NUM_BOIDS=200), otherwise a float."""
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def parse_grid(specs):
+    """Parse ``NAME=v1,v2,...`` strings into a grid dict."""
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        grid[name] = [parse_value(value) for value in values.split(",")]
+    return grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel parameter sweep of the flocking simulation")
+    parser.add_argument("grid", nargs="+", metavar="NAME=v1,v2,...",
+                        help="parameter values to sweep, e.g. ALIGNMENT_WEIGHT=0,0.5,1")
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--boids", type=int, default=100)
+    parser.add_argument("--replicates", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engine", choices=("arrays", "boids"), default="arrays")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--output", default="sweep.csv")
+    args = parser.parse_args()
+
+    run_sweep(parse_grid(args.grid), args.output, args.steps, args.boids, args.replicates,
+              args.seed, args.engine, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import numpy as np
+import pygame
+import pytest
+
+import main
+from main import Boid, FlockArrays, parameters
+
+
+def frozen_flock(n=300, seed=7):
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform((0, 0), (main.WIDTH, main.HEIGHT), size=(n, 2))
+    velocities = rng.uniform(-2, 2, size=(n, 2))
+    boids = []
+    for position, velocity in zip(positions, velocities):
+        boid = Boid(*position)
+        boid.velocity = pygame.Vector2(*velocity)
+        boids.append(boid)
+    return FlockArrays(positions, velocities), boids
+
+
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"AVOID_RADIUS": 60},
+    {"AVOID_RADIUS": 60, "FOV_ANGLE": 270},
+    {"NEIGHBOR_RADIUS": 30, "AVOID_RADIUS": 45, "FOV_ANGLE": 300},
+])
+@pytest.mark.parametrize("chunk_size", [4096, 37])
+def test_flock_arrays_steering_matches_boid_rules(overrides, chunk_size):
+    with parameters(**overrides):
+        flock, boids = frozen_flock()
+        expected = np.array([tuple(boid.steering(boids)) for boid in boids])
+        np.testing.assert_allclose(flock.steering(chunk_size), expected, rtol=0, atol=1e-12)
@@ -0,0 +1,139 @@
+import argparse
+import os
+
+import numpy as np
+import pygame
+
+import main as flocking
+
+MAGIC = b"BOIDTRJ1"
+# Fixed 64-byte header followed by float32 frames of shape (num_boids, 4): x, y, vx, vy
+HEADER_DTYPE = np.dtype([("magic", "S8"), ("num_boids", "<i8"), ("every", "<i8"),
+                         ("width", "<f8"), ("height", "<f8"), ("reserved", "V24")])
+FRAME_DTYPE = np.dtype("<f4")
+
+
+class TrajectoryRecorder:
+    """Observer for ``run_headless`` that appends every ``every``-th step to a trajectory file.
+
+    Frames are buffered and written ``chunk_frames`` at a time. Use it as a
+    context manager, or call ``close`` to write the last partial chunk.
+    """
+
+    def __init__(self, path, num_boids, every=1, chunk_frames=64, width=None, height=None):
+        self.every = every
+        self.buffer = np.empty((chunk_frames, num_boids, 4), dtype=FRAME_DTYPE)
+        self.buffered = 0
+        self.file = open(path, "wb")
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header["magic"] = MAGIC
+        header["num_boids"] = num_boids
+        header["every"] = every
+        header["width"] = flocking.WIDTH if width is None else width
+        header["height"] = flocking.HEIGHT if height is None else height
+        header.tofile(self.file)
+
+    def __call__(self, step, flock):
+        if (step + 1) % self.every:
+            return True
+        frame = self.buffer[self.buffered]
+        frame[:, :2] = flock.positions
+        frame[:, 2:] = flock.velocities
+        self.buffered += 1
+        if self.buffered == len(self.buffer):
+            self.flush()
+        return True
+
+    def flush(self):
+        self.buffer[:self.buffered].tofile(self.file)
+        self.file.flush()
+        self.buffered = 0
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_trajectory(path):
+    """Memory-map a trajectory file.
+
+    Returns the header as a dict and a read-only (frames, num_boids, 4)
+    float32 array. A frame left incomplete by an interrupted run is ignored.
+    """
+    header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)[0]
+    if header["magic"] != MAGIC:
+        raise ValueError(f"{path} is not a trajectory file")
+    num_boids = int(header["num_boids"])
+    frame_bytes = num_boids * 4 * FRAME_DTYPE.itemsize
+    frames = (os.path.getsize(path) - HEADER_DTYPE.itemsize) // frame_bytes if frame_bytes else 0
+    info = {"num_boids": num_boids, "every": int(header["every"]),
+            "width": float(header["width"]), "height": float(header["height"]), "frames": frames}
+    if frames == 0:
+        return info, np.empty((0, num_boids, 4), dtype=FRAME_DTYPE)
+    data = np.memmap(path, dtype=FRAME_DTYPE, mode="r", offset=HEADER_DTYPE.itemsize,
+                     shape=(frames, num_boids, 4))
+    return info, data
+
+
+def replay(path, fps=60, skip=1):
+    """Play a trajectory file back in a pygame window, reading frames straight from disk.
+
+    Space pauses, left/right arrows step back and forward while paused
+    (or jump 10 seconds while playing), Home restarts, Escape quits.
+    """
+    info, frames = open_trajectory(path)
+    pygame.init()
+    screen = pygame.display.set_mode((int(info["width"]), int(info["height"])))
+    clock = pygame.time.Clock()
+    frame, paused, running = 0, False, len(frames) > 0
+
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                jump = 1 if paused else 10 * fps * skip
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                elif event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key == pygame.K_RIGHT:
+                    frame = min(frame + jump, len(frames) - 1)
+                elif event.key == pygame.K_LEFT:
+                    frame = max(frame - jump, 0)
+                elif event.key == pygame.K_HOME:
+                    frame = 0
+
+        screen.fill((30, 30, 30))
+        for x, y, vx, vy in frames[frame]:
+            flocking.draw_arrow(screen, (255, 255, 255), pygame.Vector2(x, y), pygame.Vector2(vx, vy),
+                                flocking.BOID_RADIUS)
+        step = (frame + 1) * info["every"]
+        pygame.display.set_caption(f"Boids replay: step {step} ({frame + 1}/{len(frames)})")
+        pygame.display.flip()
+        clock.tick(fps)
+
+        if not paused:
+            frame = min(frame + skip, len(frames) - 1)
+
+    pygame.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded flocking trajectory")
+    parser.add_argument("path")
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--skip", type=int, default=1, help="frames to advance per displayed frame")
+    args = parser.parse_args()
+    replay(args.path, args.fps, args.skip)
+
+
+if __name__ == "__main__":
+    main()
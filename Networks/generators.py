@@ -0,0 +1,91 @@
+import numpy as np
+
+from graph_store import csr_from_edges
+
+MAX_REWIRING_ROUNDS = 100  # Redraws before a Watts-Strogatz edge is left in place
+
+
+def pair_from_index(k):
+    """Node pairs (i, j), i > j, numbered row by row through the lower triangle.
+
+    Pair ``k`` is (i, j) with ``k = i(i - 1)/2 + j``, so every number in
+    ``0..N(N - 1)/2 - 1`` is a distinct pair of an ``N``-node graph.
+    """
+    k = np.asarray(k, dtype=np.int64)
+    i = ((1 + np.sqrt(1 + 8 * k.astype(np.float64))) // 2).astype(np.int64)
+    # Correct the rounding of the square root for very large k
+    i[i * (i - 1) // 2 > k] -= 1
+    i[(i + 1) * i // 2 <= k] += 1
+    return np.column_stack([i, k - i * (i - 1) // 2])
+
+
+def erdos_renyi_gnl(N, L, seed=None):
+    """G(N, L): ``L`` distinct edges drawn uniformly from all pairs of ``N`` nodes.
+
+    Pair numbers are sampled without replacement, which for sparse graphs
+    takes O(L) time and memory rather than listing all N(N - 1)/2 pairs.
+    """
+    rng = np.random.default_rng(seed)
+    pairs = N * (N - 1) // 2
+    if L > pairs:
+        raise ValueError(f"G({N}, L) has at most {pairs} edges, not {L}")
+    return csr_from_edges(pair_from_index(rng.choice(pairs, L, replace=False)), N)
+
+
+def erdos_renyi_gnp(N, p, seed=None):
+    """G(N, p): every pair of ``N`` nodes is linked with probability ``p``.
+
+    Instead of a coin flip per pair, the gaps between linked pair numbers
+    are drawn from a geometric distribution, so the cost is O(N + L).
+    """
+    rng = np.random.default_rng(seed)
+    pairs = N * (N - 1) // 2
+    if p <= 0 or pairs == 0:
+        return csr_from_edges(np.empty((0, 2), dtype=np.int64), N)
+
+    batch = max(int(pairs * p * 1.1), 1024)
+    chosen = []
+    last = -1
+    while last < pairs:
+        k = last + np.cumsum(rng.geometric(p, batch))
+        last = k[-1]
+        chosen.append(k[k < pairs])
+    return csr_from_edges(pair_from_index(np.concatenate(chosen)), N)
+
+
+def watts_strogatz(N, k, beta, seed=None):
+    """Watts-Strogatz small world: a ring where each node links to its ``k`` nearest neighbours,
+    then the far end of every edge is moved to a random node with probability ``beta``.
+
+    As in ``nx.watts_strogatz_graph`` a rewired edge never becomes a
+    self-loop or a repeated edge. All edges are rewired together: the new
+    ends are drawn at once and only the ones that collide are redrawn, for
+    at most ``MAX_REWIRING_ROUNDS`` rounds before an edge is left as it was.
+    """
+    rng = np.random.default_rng(seed)
+    nodes = np.arange(N, dtype=np.int64)
+    offsets = np.arange(1, k // 2 + 1, dtype=np.int64)
+    u = np.repeat(nodes, len(offsets))
+    v = (u + np.tile(offsets, N)) % N
+
+    def key(a, b):
+        return np.minimum(a, b) * N + np.maximum(a, b)
+
+    pending = np.flatnonzero(rng.random(len(u)) < beta)
+    # Edges still waiting keep their old place, so giving up on one never adds a duplicate
+    occupied = np.sort(key(u, v))
+    for _ in range(MAX_REWIRING_ROUNDS):
+        if not len(pending):
+            break
+        targets = rng.integers(0, N, len(pending))
+        candidates = key(u[pending], targets)
+        _, first = np.unique(candidates, return_index=True)
+        unique = np.zeros(len(pending), dtype=bool)
+        unique[first] = True
+        taken = occupied[np.minimum(np.searchsorted(occupied, candidates), len(occupied) - 1)] == candidates
+        accepted = (targets != u[pending]) & unique & ~taken
+        v[pending[accepted]] = targets[accepted]
+        occupied = np.sort(np.concatenate([occupied, candidates[accepted]]))
+        pending = pending[~accepted]
+
+    return csr_from_edges(np.column_stack([u, v]), N)
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import networkx as nx
+import numpy as np
+
+CACHE_DIR = ".graph_cache"
+
+
+class CSRGraph:
+    """Undirected simple graph stored as compressed sparse rows.
+
+    The neighbours of node ``u`` are ``indices[indptr[u]:indptr[u + 1]]`` in
+    increasing order, and every edge appears once from each end. ``labels``
+    holds the name of every node in the source, or is None when the nodes
+    are simply 0..N-1.
+    """
+
+    def __init__(self, indptr, indices, labels=None):
+        self.indptr = indptr
+        self.indices = indices
+        self.labels = labels
+
+    @property
+    def num_nodes(self):
+        return len(self.indptr) - 1
+
+    @property
+    def num_edges(self):
+        return len(self.indices) // 2
+
+    def degrees(self):
+        return np.diff(self.indptr)
+
+    def neighbours(self, u):
+        return self.indices[self.indptr[u]:self.indptr[u + 1]]
+
+    def edges(self):
+        """(num_edges, 2) array with every edge once, as (u, v) with u < v."""
+        rows = np.repeat(np.arange(self.num_nodes, dtype=self.indices.dtype), self.degrees())
+        upper = rows < self.indices
+        return np.column_stack([rows[upper], self.indices[upper]])
+
+    def to_networkx(self):
+        G = nx.Graph()
+        nodes = range(self.num_nodes) if self.labels is None else self.labels.tolist()
+        G.add_nodes_from(nodes)
+        edges = self.edges()
+        if self.labels is not None:
+            edges = self.labels[edges]
+        G.add_edges_from(edges.tolist())
+        return G
+
+
+def csr_from_edges(edges, num_nodes=None, labels=None):
+    """Build a ``CSRGraph`` from an (E, 2) array of node numbers.
+
+    Self-loops and repeated edges are dropped, and an edge may be given in
+    either direction.
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    if num_nodes is None:
+        num_nodes = int(edges.max()) + 1 if len(edges) else 0
+
+    # Sorting the (u, v) keys groups neighbours by node and orders them in one go
+    keys = np.unique(np.concatenate([edges[:, 0] * num_nodes + edges[:, 1],
+                                     edges[:, 1] * num_nodes + edges[:, 0]]))
+    rows, columns = np.divmod(keys, max(num_nodes, 1))
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_nodes), out=indptr[1:])
+    if indptr[-1] <= np.iinfo(np.int32).max:
+        indptr = indptr.astype(np.int32)
+    return CSRGraph(indptr, columns.astype(np.int32), labels)
+
+
+def csr_from_networkx(G):
+    nodes = list(G)
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = np.array([(index[u], index[v]) for u, v in G.edges()], dtype=np.int64)
+    labels = None if nodes == list(range(len(nodes))) else np.array(nodes)
+    return csr_from_edges(edges, len(nodes), labels)
+
+
+def read_edge_list(path):
+    """Parse a whitespace-separated edge list, numbering nodes in order of first appearance.
+
+    This is the node order ``nx.read_edgelist`` gives, and the labels are
+    kept as strings as it does. Anything after ``#`` is a comment.
+    """
+    index = {}
+    edges = []
+    with open(path) as file:
+        for line in file:
+            fields = line.split("#", 1)[0].split()
+            if len(fields) < 2:
+                continue
+            edges.append(index.setdefault(fields[0], len(index)))
+            edges.append(index.setdefault(fields[1], len(index)))
+    return csr_from_edges(np.array(edges, dtype=np.int64), len(index), np.array(list(index), dtype=str))
+
+
+def file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def save_csr(directory, graph, meta=None):
+    """Write a graph as .npy files in ``directory``, replacing it atomically."""
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    tmp_directory = tempfile.mkdtemp(dir=parent)
+    np.save(os.path.join(tmp_directory, "indptr.npy"), graph.indptr)
+    np.save(os.path.join(tmp_directory, "indices.npy"), graph.indices)
+    if graph.labels is not None:
+        np.save(os.path.join(tmp_directory, "labels.npy"), graph.labels)
+    with open(os.path.join(tmp_directory, "meta.json"), "w") as file:
+        json.dump(meta or {}, file, indent=2)
+    try:
+        os.replace(tmp_directory, directory)
+    except OSError:
+        # Another process stored the same graph first
+        shutil.rmtree(tmp_directory)
+
+
+def load_csr(directory):
+    """Memory-map a graph written by ``save_csr``."""
+    arrays = {}
+    for name in ("indptr", "indices", "labels"):
+        path = os.path.join(directory, f"{name}.npy")
+        arrays[name] = np.load(path, mmap_mode="r") if os.path.exists(path) else None
+    return CSRGraph(arrays["indptr"], arrays["indices"], arrays["labels"])
+
+
+def cached(key, build, meta, cache_dir, as_networkx):
+    directory = os.path.join(cache_dir, key)
+    if not os.path.exists(os.path.join(directory, "meta.json")):
+        save_csr(directory, build(), meta)
+    graph = load_csr(directory)
+    return graph.to_networkx() if as_networkx else graph
+
+
+def load_edge_list(path, cache_dir=CACHE_DIR, as_networkx=False):
+    """Load an edge list file, converting it to CSR only the first time.
+
+    The cache is keyed by the SHA-256 of the file's contents, so an edited
+    file is converted again. Returns the memory-mapped ``CSRGraph``, or a
+    networkx graph built from it with ``as_networkx``.
+    """
+    key = f"file-{file_hash(path)[:32]}"
+    meta = {"source": os.path.abspath(path)}
+    return cached(key, lambda: read_edge_list(path), meta, cache_dir, as_networkx)
+
+
+def generated_graph(generator, seed, cache_dir=CACHE_DIR, as_networkx=False, **params):
+    """Call ``generator(seed=seed, **params)`` once per parameter set and cache the result.
+
+    The generator may return a networkx graph, a ``CSRGraph`` or an (E, 2)
+    edge array. The cache key is its qualified name, the parameters and the
+    seed; with ``seed=None`` the graph is random every time and is not
+    cached.
+    """
+    def build():
+        graph = generator(seed=seed, **params)
+        if isinstance(graph, CSRGraph):
+            return graph
+        if isinstance(graph, nx.Graph):
+            return csr_from_networkx(graph)
+        return csr_from_edges(graph)
+
+    if seed is None:
+        graph = build()
+        return graph.to_networkx() if as_networkx else graph
+
+    meta = {"generator": f"{generator.__module__}.{generator.__qualname__}", "params": params, "seed": seed}
+    key = "generated-" + hashlib.sha256(json.dumps(meta, sort_keys=True, default=str).encode()).hexdigest()[:32]
+    return cached(key, build, meta, cache_dir, as_networkx)
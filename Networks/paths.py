@@ -0,0 +1,153 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+_graph = None  # (indptr, indices) of the graph in a worker process
+
+
+class PathLengths:
+    """Shortest-path length counts from a set of BFS sources.
+
+    ``per_source[i, d]`` is the number of nodes at distance ``d`` from
+    ``sources[i]``. With every node as a source the statistics are exact;
+    with a sample of sources ``average`` is an estimate,
+    ``confidence_interval`` gives its uncertainty, and ``diameter`` is a lower
+    bound.
+    """
+
+    def __init__(self, per_source, sources, num_nodes):
+        self.per_source = per_source
+        self.sources = sources
+        self.num_nodes = num_nodes
+
+    @property
+    def exact(self):
+        return len(self.sources) == self.num_nodes
+
+    @property
+    def counts(self):
+        """Ordered (source, target) pairs at each distance, indexed by distance."""
+        return self.per_source.sum(axis=0)
+
+    @property
+    def pairs(self):
+        return int(self.counts.sum())
+
+    @property
+    def unreachable(self):
+        """(source, target) pairs with no path between them."""
+        return len(self.sources) * (self.num_nodes - 1) - self.pairs
+
+    @property
+    def connected(self):
+        """Whether every source reaches every node. Only conclusive when exact."""
+        return self.unreachable == 0
+
+    @property
+    def diameter(self):
+        return int(np.flatnonzero(self.counts)[-1]) if self.pairs else 0
+
+    @property
+    def average(self):
+        """Mean length over the pairs that are connected."""
+        return float(self.counts @ np.arange(len(self.counts)) / self.pairs) if self.pairs else float("nan")
+
+    def distribution(self):
+        """{length: fraction of connected pairs}, as ``calculate_shortest_path_distribution`` gives."""
+        counts = self.counts
+        return {d: int(c) / self.pairs for d, c in enumerate(counts) if c}
+
+    def confidence_interval(self, z=1.96):
+        """Normal-approximation interval for ``average`` from the spread between sources.
+
+        The average is a ratio of per-source path-length sums to per-source
+        pair counts, so its variance is estimated by linearisation, with a
+        finite-population correction for sampling sources without
+        replacement. Exact results give a zero-width interval.
+        """
+        average = self.average
+        samples = len(self.sources)
+        if self.exact or samples < 2:
+            return average, average
+        totals = self.per_source @ np.arange(self.per_source.shape[1])
+        reached = self.per_source.sum(axis=1)
+        residuals = totals - average * reached
+        variance = (residuals @ residuals / (samples - 1) / (samples * reached.mean() ** 2)
+                    * (1 - samples / self.num_nodes))
+        half_width = z * variance ** 0.5
+        return average - half_width, average + half_width
+
+
+def bfs_counts(indptr, indices, sources):
+    """Run BFS from every node in ``sources`` at once and count nodes per distance.
+
+    Each node holds a bitset with one bit per source, so one level of all
+    the searches is a gather over the adjacency and an OR per node.
+    Returns a (len(sources), max distance + 1) count array.
+    """
+    num_nodes = len(indptr) - 1
+    num_sources = len(sources)
+    words = -(-num_sources // 64)
+    column = np.arange(num_sources)
+    bits = np.left_shift(np.uint64(1), (column % 64).astype(np.uint64))
+
+    visited = np.zeros((num_nodes, words), dtype="<u8")
+    visited[sources, column // 64] = bits
+    frontier = visited.copy()
+    isolated = np.diff(indptr) == 0
+    # A zero row at the end keeps reduceat in range for trailing isolated nodes
+    padding = np.zeros((1, words), dtype="<u8")
+
+    levels = [np.zeros(num_sources, dtype=np.int64)]  # The source itself is not a path
+    while True:
+        gathered = np.concatenate([frontier[indices], padding])
+        reached = np.bitwise_or.reduceat(gathered, indptr[:-1], axis=0)
+        reached[isolated] = 0
+        frontier = reached & ~visited
+        if not frontier.any():
+            break
+        visited |= frontier
+        found = np.unpackbits(frontier.view(np.uint8), axis=1, bitorder="little").sum(axis=0)
+        levels.append(found[:num_sources])
+
+    return np.array(levels, dtype=np.int64).T
+
+
+def _init_worker(indptr, indices):
+    global _graph
+    _graph = (indptr, indices)
+
+
+def _bfs_worker(sources):
+    return bfs_counts(*_graph, sources)
+
+
+def shortest_path_lengths(graph, samples=None, seed=None, workers=None, block_size=256):
+    """Histogram of shortest-path lengths of a ``CSRGraph``, without storing any distances.
+
+    Sources are processed ``block_size`` at a time, spread over ``workers``
+    processes (in this process when ``workers`` is 1). With ``samples``,
+    only that many distinct sources drawn with ``seed`` are used.
+    """
+    num_nodes = graph.num_nodes
+    if samples is None or samples >= num_nodes:
+        sources = np.arange(num_nodes)
+    else:
+        sources = np.sort(np.random.default_rng(seed).choice(num_nodes, samples, replace=False))
+    indptr, indices = np.asarray(graph.indptr), np.asarray(graph.indices)
+    blocks = [sources[start:start + block_size] for start in range(0, len(sources), block_size)]
+
+    if workers == 1 or len(blocks) <= 1:
+        results = [bfs_counts(indptr, indices, block) for block in blocks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(indptr, indices)) as executor:
+            results = list(executor.map(_bfs_worker, blocks))
+
+    depth = max((counts.shape[1] for counts in results), default=1)
+    per_source = np.zeros((len(sources), depth), dtype=np.int64)
+    row = 0
+    for counts in results:
+        per_source[row:row + len(counts), :counts.shape[1]] = counts
+        row += len(counts)
+    return PathLengths(per_source, sources, num_nodes)
@@ -0,0 +1,157 @@
+import numpy as np
+
+
+def stack(components, shape):
+    """Components that may be constants, broadcast to ``shape`` and stacked on a last axis."""
+    return np.stack([np.broadcast_to(np.asarray(c, dtype=float), shape) for c in components], axis=-1)
+
+
+def evaluate(f, x, y):
+    """``f(x, y)`` on arrays as a (..., 2) array."""
+    return stack(f(x, y), np.broadcast(x, y).shape)
+
+
+def analytical_jacobian(jacobian, x, y):
+    """``jacobian(x, y)``, given as ((df/dx, df/dy), (dg/dx, dg/dy)), as a (..., 2, 2) array."""
+    shape = np.broadcast(x, y).shape
+    (a, b), (c, d) = jacobian(x, y)
+    return stack((a, b, c, d), shape).reshape(shape + (2, 2))
+
+
+def finite_difference_jacobian(f, x, y, step=1e-6):
+    """Central-difference Jacobian of ``f`` at every point, shape (..., 2, 2)."""
+    hx = step * (1 + np.abs(x))
+    hy = step * (1 + np.abs(y))
+    d_dx = (evaluate(f, x + hx, y) - evaluate(f, x - hx, y)) / (2 * hx)[..., None]
+    d_dy = (evaluate(f, x, y + hy) - evaluate(f, x, y - hy)) / (2 * hy)[..., None]
+    return np.stack([d_dx, d_dy], axis=-1)
+
+
+def parabola(trace):
+    """Determinant at which eigenvalues turn complex, det = T^2 / 4."""
+    return trace ** 2 / 4
+
+
+def classify(trace, determinant, tol=1e-9):
+    """Type of a fixed point from the trace and determinant of its Jacobian."""
+    if determinant < -tol:
+        return "saddle"
+    if abs(determinant) <= tol:
+        return "non-isolated"
+    if abs(trace) <= tol:
+        return "center"
+    stability = "stable" if trace < 0 else "unstable"
+    if abs(determinant - parabola(trace)) <= tol:
+        return f"{stability} degenerate node"
+    return f"{stability} {'spiral' if determinant > parabola(trace) else 'node'}"
+
+
+class FixedPoint:
+    def __init__(self, x, y, jacobian):
+        self.x = x
+        self.y = y
+        self.jacobian = jacobian
+
+    @property
+    def trace(self):
+        return float(np.trace(self.jacobian))
+
+    @property
+    def determinant(self):
+        return float(np.linalg.det(self.jacobian))
+
+    @property
+    def kind(self):
+        return classify(self.trace, self.determinant)
+
+    def __repr__(self):
+        return f"FixedPoint({self.x:.6g}, {self.y:.6g}, {self.kind})"
+
+
+def newton(f, seeds, jacobian=None, tol=1e-10, max_iter=50):
+    """Newton iterations from every seed at once.
+
+    ``jacobian(x, y)`` returns ((df/dx, df/dy), (dg/dx, dg/dy)) on arrays;
+    without it central differences are used. Returns the final points and
+    whether each converged to a root: its last step was below ``tol``
+    relative to its size and ``|f|`` there is small.
+    """
+    points = np.array(seeds, dtype=float).reshape(-1, 2)
+    converged = np.zeros(len(points), dtype=bool)
+    active = np.arange(len(points))
+
+    with np.errstate(all="ignore"):
+        for _ in range(max_iter):
+            if not len(active):
+                break
+            x, y = points[active, 0], points[active, 1]
+            F = evaluate(f, x, y)
+            if jacobian is None:
+                J = finite_difference_jacobian(f, x, y)
+            else:
+                J = analytical_jacobian(jacobian, x, y)
+            det = J[:, 0, 0] * J[:, 1, 1] - J[:, 0, 1] * J[:, 1, 0]
+            dx = (J[:, 1, 1] * F[:, 0] - J[:, 0, 1] * F[:, 1]) / det
+            dy = (J[:, 0, 0] * F[:, 1] - J[:, 1, 0] * F[:, 0]) / det
+            points[active, 0] -= dx
+            points[active, 1] -= dy
+
+            finite = np.isfinite(dx) & np.isfinite(dy)
+            small = finite & (np.hypot(dx, dy) <= tol * (1 + np.hypot(*points[active].T)))
+            converged[active[small]] = True
+            active = active[finite & ~small]
+
+        residual = np.linalg.norm(evaluate(f, points[:, 0], points[:, 1]), axis=-1)
+    return points, converged & (residual <= np.sqrt(tol))
+
+
+def find_fixed_points(f, x_range, y_range, num_points=20, jacobian=None, tol=1e-10, merge_tol=1e-6):
+    """Fixed points of ``f`` inside the box, found by Newton from a seed grid.
+
+    Roots closer than ``merge_tol`` are merged, and each is classified from
+    its Jacobian. Returns ``FixedPoint`` objects sorted by position.
+    """
+    X, Y = np.meshgrid(np.linspace(*x_range, num_points), np.linspace(*y_range, num_points))
+    roots, converged = newton(f, np.column_stack([X.ravel(), Y.ravel()]), jacobian, tol)
+    (x_min, x_max), (y_min, y_max) = x_range, y_range
+    inside = ((roots[:, 0] >= x_min) & (roots[:, 0] <= x_max)
+              & (roots[:, 1] >= y_min) & (roots[:, 1] <= y_max))
+
+    unique = []
+    for root in roots[converged & inside]:
+        if not unique or np.min(np.hypot(*(np.array(unique) - root).T)) > merge_tol:
+            unique.append(root)
+    if not unique:
+        return []
+    # Sort on coordinates rounded to merge_tol, so round-off cannot reorder equal ones
+    unique = np.array(unique)
+    unique[np.round(unique / merge_tol) == 0] = 0.0  # Round-off left around zero
+    unique = np.array(sorted(unique, key=lambda root: tuple(np.round(root / merge_tol))))
+
+    if jacobian is None:
+        jacobians = finite_difference_jacobian(f, unique[:, 0], unique[:, 1])
+    else:
+        jacobians = analytical_jacobian(jacobian, unique[:, 0], unique[:, 1])
+    return [FixedPoint(float(x), float(y), J) for (x, y), J in zip(unique, jacobians)]
+
+
+def nullclines(f, x_range, y_range, resolution=400):
+    """``f`` on a meshgrid, as X, Y, fx, fy.
+
+    The zero contours of ``fx`` and ``fy`` (``plt.contour(X, Y, fx, [0])``)
+    are the x- and y-nullclines, and they cross at the fixed points.
+    """
+    X, Y = np.meshgrid(np.linspace(*x_range, resolution), np.linspace(*y_range, resolution))
+    with np.errstate(all="ignore"):
+        F = evaluate(f, X, Y)
+    return X, Y, F[..., 0], F[..., 1]
+
+
+def calculate_isocline(f, slope, x_range, resolution=500):
+    """``slope * fx / fy`` along y = 1, evaluated on the whole x grid at once; NaN where undefined."""
+    xs = np.linspace(*x_range, resolution)
+    with np.errstate(all="ignore"):
+        F = evaluate(f, xs, np.ones_like(xs))
+        ys = slope * F[:, 0] / F[:, 1]
+    ys[~np.isfinite(ys)] = np.nan
+    return xs, ys
@@ -0,0 +1,220 @@
+import numpy as np
+
+MAX_VALUE = 1e4  # Trajectories leaving [-MAX_VALUE, MAX_VALUE] are stopped
+
+
+def euler_step(x, y, f, dt):
+    fx, fy = f(x, y)
+    return x + dt * fx, y + dt * fy
+
+
+def midpoint_step(x, y, f, dt):
+    fx, fy = f(x, y)
+    kx = dt * fx
+    ky = dt * fy
+    mx, my = f(x + kx / 2, y + ky / 2)
+    return x + dt * mx, y + dt * my
+
+
+def rk4_step(x, y, f, dt):
+    k1x, k1y = f(x, y)
+    k2x, k2y = f(x + dt / 2 * k1x, y + dt / 2 * k1y)
+    k3x, k3y = f(x + dt / 2 * k2x, y + dt / 2 * k2y)
+    k4x, k4y = f(x + dt * k3x, y + dt * k3y)
+    return (x + dt / 6 * (k1x + 2 * k2x + 2 * k3x + k4x),
+            y + dt / 6 * (k1y + 2 * k2y + 2 * k3y + k4y))
+
+
+METHODS = {"euler": euler_step, "midpoint": midpoint_step, "rk4": rk4_step}
+
+
+def integrate(f, initial_conditions, dt=0.01, steps=1000, method="midpoint", max_value=MAX_VALUE):
+    """Advance every initial condition at once with a fixed-step scheme.
+
+    ``f(x, y)`` must accept arrays, as NumPy expressions do. Returns a
+    (steps + 1, M, 2) array of the M trajectories and the number of valid
+    rows of each. A trajectory that leaves [-max_value, max_value] is
+    stored clamped to the box at that step and not advanced any further;
+    its later rows are NaN, which matplotlib leaves undrawn.
+    """
+    step = METHODS[method]
+    points = np.asarray(initial_conditions, dtype=float).reshape(-1, 2)
+    trajectories = np.full((steps + 1, len(points), 2), np.nan)
+    trajectories[0] = points
+    lengths = np.full(len(points), steps + 1)
+
+    active = np.arange(len(points))
+    x, y = points[:, 0].copy(), points[:, 1].copy()
+    with np.errstate(over="ignore", invalid="ignore"):
+        for i in range(1, steps + 1):
+            if not len(active):
+                break
+            x, y = step(x, y, f, dt)
+            x = np.broadcast_to(x, active.shape).astype(float)
+            y = np.broadcast_to(y, active.shape).astype(float)
+            trajectories[i, active, 0] = np.clip(x, -max_value, max_value)
+            trajectories[i, active, 1] = np.clip(y, -max_value, max_value)
+
+            inside = (np.abs(x) < max_value) & (np.abs(y) < max_value)
+            lengths[active[~inside]] = i + 1
+            active, x, y = active[inside], x[inside], y[inside]
+
+    return trajectories, lengths
+
+
+# Dormand-Prince 5(4) tableau for autonomous systems. The last stage is f at the
+# new point, reused as the next first stage.
+DP_A = tuple(np.array(row) for row in (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+))
+# Difference between the fifth- and fourth-order solutions, per stage
+DP_E = np.array([71 / 57600, 0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40])
+
+
+class Trajectory:
+    """Accepted steps of an adaptive integration, with cubic Hermite dense output.
+
+    ``event`` is why the integration stopped: ``"escape"``, ``"fixed_point"``,
+    ``"closed_orbit"``, ``"max_steps"`` or None when ``t_max`` was reached.
+    ``event_time`` is when it happened, and for a closed orbit it is the
+    period.
+    """
+
+    def __init__(self, t, states, derivatives, event=None, event_time=None):
+        self.t = np.asarray(t)
+        self.states = np.asarray(states)
+        self.derivatives = np.asarray(derivatives)
+        self.event = event
+        self.event_time = event_time
+
+    @property
+    def xs(self):
+        return self.states[:, 0]
+
+    @property
+    def ys(self):
+        return self.states[:, 1]
+
+    @property
+    def steps(self):
+        return len(self.t) - 1
+
+    def __call__(self, t):
+        """State at time(s) ``t`` within the integrated range, shape (..., 2)."""
+        t = np.clip(np.asarray(t, dtype=float), self.t[0], self.t[-1])
+        i = np.clip(np.searchsorted(self.t, t, side="right") - 1, 0, max(len(self.t) - 2, 0))
+        if len(self.t) == 1:
+            return np.broadcast_to(self.states[0], t.shape + (2,)).copy()
+        h = (self.t[i + 1] - self.t[i])[..., None]
+        s = ((t - self.t[i])[..., None] / h)
+        y0, y1 = self.states[i], self.states[i + 1]
+        f0, f1 = self.derivatives[i], self.derivatives[i + 1]
+        return ((2 * s ** 3 - 3 * s ** 2 + 1) * y0 + (s ** 3 - 2 * s ** 2 + s) * h * f0
+                + (-2 * s ** 3 + 3 * s ** 2) * y1 + (s ** 3 - s ** 2) * h * f1)
+
+    def sample(self, dt):
+        """Evenly spaced points for plotting, as ``xs, ys``."""
+        points = self(np.arange(self.t[0], self.t[-1] + dt / 2, dt))
+        return points[:, 0], points[:, 1]
+
+
+def dormand_prince(f, x0, y0, t_max, rtol=1e-6, atol=1e-9, max_value=MAX_VALUE,
+                   fixed_point_tol=1e-8, orbit_tol=1e-4, max_steps=100_000):
+    """Integrate one trajectory of ``f(x, y)`` with Dormand-Prince 5(4) and step-size control.
+
+    The step grows where the flow is smooth and shrinks where the local error
+    estimate exceeds ``atol + rtol * |state|``. Integration stops early when:
+
+    * the trajectory leaves [-max_value, max_value] (``"escape"``);
+    * ``|f|`` drops below ``fixed_point_tol`` (``"fixed_point"``);
+    * it comes back through the line through the start point, across the
+      initial velocity, within ``orbit_tol`` of the start (``"closed_orbit"``).
+    """
+    def rhs(state):
+        fx, fy = f(state[0], state[1])
+        return np.array([fx, fy], dtype=float)
+
+    start = np.array([x0, y0], dtype=float)
+    state, k_first = start, rhs(start)
+    t = 0.0
+    times, states, derivatives = [t], [state], [k_first]
+    direction = k_first
+    speed = np.linalg.norm(direction)
+    section = 0.0  # Signed distance from the start along the initial velocity
+
+    scale = atol + rtol * np.abs(state)
+    d0, d1 = np.linalg.norm(state / scale), np.linalg.norm(k_first / scale)
+    h = 0.01 * d0 / d1 if d0 > 1e-5 and d1 > 1e-5 else 1e-6
+    h = min(h, t_max)
+
+    def finish(event, event_time=None):
+        return Trajectory(times, states, derivatives, event, event_time)
+
+    if speed < fixed_point_tol:
+        return finish("fixed_point", 0.0)
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        while t < t_max:
+            if len(times) > max_steps:
+                return finish("max_steps", t)
+            h = min(h, t_max - t)
+            k = np.empty((len(DP_A), 2))
+            k[0] = k_first
+            for i in range(1, len(DP_A)):
+                k[i] = rhs(state + h * (DP_A[i] @ k[:i]))
+            new_state = state + h * (DP_A[-1] @ k[:-1])
+            error = h * (DP_E @ k)
+            scale = atol + rtol * np.maximum(np.abs(state), np.abs(new_state))
+            norm = np.sqrt(np.mean((error / scale) ** 2))
+
+            if not np.isfinite(norm):
+                # The step overflowed: retry a shorter one, down to a limit
+                if h > 1e-12:
+                    h /= 5
+                    continue
+            elif norm > 1:
+                h *= max(0.2, 0.9 * norm ** -0.2)
+                continue
+            if not np.all(np.abs(new_state) < max_value):
+                times.append(t + h)
+                states.append(np.clip(new_state, -max_value, max_value))
+                derivatives.append(k[-1])
+                return finish("escape", t + h)
+
+            t += h
+            state, k_first = new_state, k[-1]
+            times.append(t)
+            states.append(state)
+            derivatives.append(k_first)
+            h *= min(5.0, 0.9 * norm ** -0.2) if norm > 0 else 5.0
+
+            if np.linalg.norm(k_first) < fixed_point_tol:
+                return finish("fixed_point", t)
+
+            previous_section = section
+            section = (state - start) @ direction
+            if previous_section < 0 <= section:
+                # Bisect the dense output for the crossing, then check it is the start point
+                trajectory = finish(None)
+                low, high = times[-2], t
+                for _ in range(50):
+                    middle = (low + high) / 2
+                    if (trajectory(middle) - start) @ direction < 0:
+                        low = middle
+                    else:
+                        high = middle
+                if np.linalg.norm(trajectory(high) - start) < orbit_tol * (1 + np.linalg.norm(start)):
+                    return finish("closed_orbit", high)
+
+    return finish(None)
+
+
+def adaptive_portrait(f, initial_conditions, t_max, **options):
+    """``dormand_prince`` from every initial condition. Options are passed on."""
+    return [dormand_prince(f, x0, y0, t_max, **options) for x0, y0 in initial_conditions]
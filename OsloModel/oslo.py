@@ -0,0 +1,422 @@
+import argparse
+import bisect
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+THRESHOLD_BUFFER = 1 << 16  # Thresholds drawn per bulk RNG call
+
+
+class OsloModel:
+    def __init__(self, size):
+        self.size = size
+        self.slopes = [random.randint(0, 2) for _ in range(size)]  # Initial heights of the sites
+        self.thresholds = [random.randint(1, 2) for _ in range(size)]  # Thresholds for each site
+
+    def drive(self):
+        """Add a grain to the first site."""
+        self.slopes[0] += 1
+
+    def relax(self):
+        """Relax the pile by redistributing grains."""
+        efflux = 0
+        avalanche_size = 0
+        while True:
+            moved = False
+            for i in range(self.size):
+                if self.slopes[i] > self.thresholds[i]:
+                    if i == 0:
+                        self.slopes[i] -= 2
+                        self.slopes[i + 1] += 1
+                    elif i == self.size - 1:
+                        self.slopes[i] -= 1
+                        self.slopes[i - 1] += 1
+                        efflux += 1
+                    else:
+                        self.slopes[i] -= 2
+                        self.slopes[i - 1] += 1
+                        self.slopes[i + 1] += 1
+                    self.thresholds[i] = random.randint(1, 2)
+                    avalanche_size += 1
+                    moved = True
+            if not moved:
+                break
+
+        return avalanche_size, efflux
+
+
+class FastOsloModel:
+    """Oslo model relaxed by following the avalanche instead of sweeping the pile.
+
+    Only sites pushed onto a stack when they or a neighbour topple are
+    visited, so a grain costs O(avalanche size) instead of O(size) per sweep.
+    New thresholds come from a buffer filled in bulk by a NumPy generator.
+    The order in which unstable sites topple does not change the statistics
+    of the Oslo model, so avalanche sizes and efflux follow the same
+    distributions as ``OsloModel``.
+    """
+
+    def __init__(self, size, rng=None):
+        self.size = size
+        self.rng = np.random.default_rng(rng)
+        self.slopes = self.rng.integers(0, 3, size).tolist()
+        self.thresholds = self.rng.integers(1, 3, size).tolist()
+        self.height = sum(self.slopes)  # Height of the first site
+        self._buffer = []
+        self._next = 0
+
+    def drive(self):
+        """Add a grain to the first site."""
+        self.slopes[0] += 1
+        self.height += 1
+
+    def relax(self):
+        """Relax the pile by toppling unstable sites until none is left."""
+        slopes, thresholds, last = self.slopes, self.thresholds, self.size - 1
+        buffer, position = self._buffer, self._next
+        efflux = 0
+        avalanche_size = 0
+        first_topplings = 0
+        stack = [0]
+
+        while stack:
+            i = stack.pop()
+            if slopes[i] <= thresholds[i]:
+                continue
+            if i == 0:
+                slopes[0] -= 2
+                slopes[1] += 1
+                first_topplings += 1
+                neighbours = (1,)
+            elif i == last:
+                slopes[i] -= 1
+                slopes[i - 1] += 1
+                efflux += 1
+                neighbours = (i - 1,)
+            else:
+                slopes[i] -= 2
+                slopes[i - 1] += 1
+                slopes[i + 1] += 1
+                neighbours = (i - 1, i + 1)
+
+            if position == len(buffer):
+                buffer = self._buffer = self.rng.integers(
+                    1, 3, THRESHOLD_BUFFER, dtype=np.int8
+                ).tolist()
+                position = 0
+            thresholds[i] = buffer[position]
+            position += 1
+            avalanche_size += 1
+
+            # The site may still be unstable, and so may its neighbours
+            stack.append(i)
+            for j in neighbours:
+                if slopes[j] > thresholds[j]:
+                    stack.append(j)
+
+        self._next = position
+        self.height -= first_topplings
+        return avalanche_size, efflux
+
+
+class SteadyStateDetector:
+    """Compare the efflux over the last ``window_size`` grains with the influx.
+
+    The window sum is updated as grains arrive, so each grain costs O(1)
+    however large the window. Once the ratio falls within
+    ``1 +- threshold`` the pile counts as steady for good.
+    """
+
+    def __init__(self, window_size=100, threshold=0.02):
+        self.window = deque(maxlen=window_size)
+        self.threshold = threshold
+        self.total = 0
+        self.grains = 0
+        self.steady_time = None  # Grain at which the steady state was reached
+
+    @property
+    def steady(self):
+        return self.steady_time is not None
+
+    @property
+    def ratio(self):
+        """Efflux over influx in the current window, or None until it is full."""
+        if len(self.window) < self.window.maxlen:
+            return None
+        return self.total / self.window.maxlen
+
+    def update(self, efflux):
+        """Add one grain's efflux and return whether the pile is steady."""
+        if len(self.window) == self.window.maxlen:
+            self.total -= self.window[0]
+        self.window.append(efflux)
+        self.total += efflux
+        self.grains += 1
+        ratio = self.ratio
+        if (self.steady_time is None and ratio is not None
+                and 1 - self.threshold <= ratio <= 1 + self.threshold):
+            self.steady_time = self.grains - 1
+        return self.steady
+
+
+def run_simulation(size, max_iterations, steady_state_threshold=0.02, window_size=100, model=FastOsloModel):
+    sim = model(size)
+    avalanche_sizes = []
+    steady_state_coeffs = []
+    detector = SteadyStateDetector(window_size, steady_state_threshold)
+
+    for t in range(max_iterations):
+        sim.drive()
+        avalanche_size, efflux = sim.relax()
+        avalanche_sizes.append(avalanche_size)
+
+        if detector.update(efflux):
+            print(f"Steady state reached at iteration {t}")
+            break
+        if detector.ratio is not None:
+            steady_state_coeffs.append(detector.ratio)
+
+    return avalanche_sizes, steady_state_coeffs
+
+
+def log_bin_edges(max_size, scale=1.2):
+    """Integer bin edges starting at 1 and growing by a factor of about ``scale``.
+
+    Every bin holds at least one integer size, and the last edge is above
+    ``max_size``.
+    """
+    edges = [1]
+    while edges[-1] <= max_size:
+        edges.append(max(edges[-1] + 1, int(np.ceil(edges[-1] * scale))))
+    return np.array(edges, dtype=np.int64)
+
+
+class AvalancheStatistics:
+    """Fixed-memory summary of the avalanches of one pile size.
+
+    ``record`` takes one grain at a time and updates:
+
+    * a histogram of avalanche sizes on log-spaced integer bins, with sizes
+      beyond the last edge counted in the last bin and size zero counted
+      apart;
+    * the sums of s, s^2, s^3 and s^4 for the moments <s^k>;
+    * the sums of the height of the first site and its square, when given;
+    * optionally a reservoir of at most ``reservoir`` raw sizes, taken every
+      ``stride``-th grain. When it fills up every other sample is dropped
+      and the stride doubles, so it always spans the whole run.
+
+    With ``wait_for_steady`` grains are only recorded once the steady-state
+    detector has fired; otherwise they are all recorded.
+    """
+
+    MOMENTS = 4
+
+    def __init__(self, size, scale=1.2, max_size=None, reservoir=0, window_size=100,
+                 steady_state_threshold=0.02, wait_for_steady=True):
+        self.size = size
+        self.edges = log_bin_edges(size ** 3 if max_size is None else max_size, scale)
+        self._edges = self.edges.tolist()
+        self.counts = [0] * (len(self.edges) - 1)
+        self.zeros = 0
+        self.grains = 0
+        self.moment_sums = [0] * self.MOMENTS
+        self.height_sums = [0, 0]
+        self.height_grains = 0
+        self.reservoir = reservoir
+        self.stride = 1
+        self.samples = []
+        self.detector = SteadyStateDetector(window_size, steady_state_threshold)
+        self.wait_for_steady = wait_for_steady
+
+    def record(self, avalanche_size, efflux=0, height=None):
+        """Add one grain. Returns whether it was recorded."""
+        if not self.detector.update(efflux) and self.wait_for_steady:
+            return False
+        self.grains += 1
+
+        if avalanche_size:
+            index = bisect.bisect_right(self._edges, avalanche_size) - 1
+            self.counts[min(index, len(self.counts) - 1)] += 1
+        else:
+            self.zeros += 1
+
+        power = 1
+        for k in range(self.MOMENTS):
+            power *= avalanche_size
+            self.moment_sums[k] += power
+
+        if height is not None:
+            self.height_sums[0] += height
+            self.height_sums[1] += height * height
+            self.height_grains += 1
+
+        if self.reservoir and self.grains % self.stride == 0:
+            self.samples.append(avalanche_size)
+            if len(self.samples) == self.reservoir:
+                self.samples = self.samples[1::2]
+                self.stride *= 2
+        return True
+
+    def merge(self, other):
+        """Add the statistics of another pile of the same size and binning.
+
+        Reservoirs are concatenated as they are.
+        """
+        if other.size != self.size or other._edges != self._edges:
+            raise ValueError("Only statistics with the same size and bins can be merged")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.zeros += other.zeros
+        self.grains += other.grains
+        self.moment_sums = [a + b for a, b in zip(self.moment_sums, other.moment_sums)]
+        self.height_sums = [a + b for a, b in zip(self.height_sums, other.height_sums)]
+        self.height_grains += other.height_grains
+        self.samples = self.samples + other.samples
+        return self
+
+    def moment(self, k):
+        """<s^k> over the recorded grains, for k = 1 to 4."""
+        return self.moment_sums[k - 1] / self.grains if self.grains else float("nan")
+
+    @property
+    def mean_height(self):
+        return self.height_sums[0] / self.height_grains if self.height_grains else float("nan")
+
+    @property
+    def height_std(self):
+        if not self.height_grains:
+            return float("nan")
+        return max(self.height_sums[1] / self.height_grains - self.mean_height ** 2, 0) ** 0.5
+
+    @property
+    def mean_slope(self):
+        return self.mean_height / self.size
+
+    def histogram(self):
+        """Geometric bin centres, counts and probability density P(s) per bin.
+
+        P(s) is normalised over all recorded grains, including those with no
+        avalanche.
+        """
+        counts = np.array(self.counts, dtype=np.int64)
+        centres = np.sqrt(self.edges[:-1] * (self.edges[1:] - 1))
+        probability = counts / (max(self.grains, 1) * np.diff(self.edges))
+        return centres, counts, probability
+
+
+def stream_simulation(size, grains, rng=None, **options):
+    """Drive a ``FastOsloModel`` until ``grains`` grains have been recorded in an ``AvalancheStatistics``.
+
+    Keyword options go to ``AvalancheStatistics``. By default the grains
+    before the steady state are only used to detect it.
+    """
+    sim = FastOsloModel(size, rng)
+    statistics = AvalancheStatistics(size, **options)
+    while statistics.grains < grains:
+        sim.drive()
+        avalanche_size, efflux = sim.relax()
+        statistics.record(avalanche_size, efflux, sim.height)
+    return statistics
+
+
+def simulate_pile(size, grains, seed, size_index, pile, scale):
+    """Drive one pile until the first grain leaves it, then ``grains`` more.
+
+    Returns the crossover time (grains added up to and including the first
+    one that caused efflux) and the ``AvalancheStatistics`` of the
+    steady-state grains.
+    """
+    model = FastOsloModel(size, np.random.SeedSequence(seed, spawn_key=(size_index, pile)))
+    crossover_time = 0
+    efflux = 0
+    while not efflux:
+        model.drive()
+        _, efflux = model.relax()
+        crossover_time += 1
+
+    statistics = AvalancheStatistics(size, scale, wait_for_steady=False)
+    for _ in range(grains):
+        model.drive()
+        avalanche_size, efflux = model.relax()
+        statistics.record(avalanche_size, efflux, model.height)
+
+    return size_index, pile, crossover_time, statistics
+
+
+def run_ensemble(sizes, piles, grains, seed=0, scale=1.2, workers=None):
+    """Run ``piles`` independent piles of every size across a process pool.
+
+    Each pile draws from its own generator, seeded from ``(seed, size index,
+    pile)``, and only its crossover time and fixed-size statistics are sent
+    back, so the result does not depend on the number of workers. Returns a
+    dict keyed by size with the bin edges, geometric bin centres, merged
+    counts, the probability density P(s) per bin (normalised over all
+    steady-state avalanches, including those of size zero), the moments
+    <s^k> for k = 1 to 4, the mean height and slope, and the crossover times
+    of every pile with their mean and standard deviation.
+    """
+    statistics = {size: None for size in sizes}
+    crossover_times = {size: np.zeros(piles, dtype=np.int64) for size in sizes}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(simulate_pile, size, grains, seed, size_index, pile, scale)
+            for size_index, size in enumerate(sizes)
+            for pile in range(piles)
+        ]
+        for future in as_completed(futures):
+            size_index, pile, crossover_time, pile_statistics = future.result()
+            size = sizes[size_index]
+            crossover_times[size][pile] = crossover_time
+            if statistics[size] is None:
+                statistics[size] = pile_statistics
+            else:
+                statistics[size].merge(pile_statistics)
+
+    results = {}
+    for size in sizes:
+        merged = statistics[size]
+        centres, counts, probability = merged.histogram()
+        results[size] = {
+            "edges": merged.edges,
+            "centres": centres,
+            "counts": counts,
+            "probability": probability,
+            "zeros": merged.zeros,
+            "grains": merged.grains,
+            "moments": np.array([merged.moment(k) for k in range(1, AvalancheStatistics.MOMENTS + 1)]),
+            "mean_height": merged.mean_height,
+            "mean_slope": merged.mean_slope,
+            "crossover_times": crossover_times[size],
+            "crossover_mean": float(np.mean(crossover_times[size])),
+            "crossover_std": float(np.std(crossover_times[size])),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ensemble of Oslo piles for finite-size scaling")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    parser.add_argument("--piles", type=int, default=8, help="independent piles per size")
+    parser.add_argument("--grains", type=int, default=100000, help="steady-state grains per pile")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scale", type=float, default=1.2, help="ratio between log-bin edges")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--output", default="oslo_ensemble.npz")
+    args = parser.parse_args()
+
+    results = run_ensemble(args.sizes, args.piles, args.grains, args.seed, args.scale, args.workers)
+    arrays = {}
+    for size, result in results.items():
+        print(f"L={size}: <t_c> = {result['crossover_mean']:.1f} +- {result['crossover_std']:.1f}, "
+              f"<h> = {result['mean_height']:.2f}, <s> = {result['moments'][0]:.2f}")
+        for name in ("edges", "centres", "counts", "probability", "moments", "crossover_times"):
+            arrays[f"L{size}_{name}"] = result[name]
+        arrays[f"L{size}_zeros"] = result["zeros"]
+        arrays[f"L{size}_mean_height"] = result["mean_height"]
+    np.savez(args.output, sizes=np.array(args.sizes), **arrays)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+import percolation_old
+from percolation import (
+    analyse_lattice,
+    burning_method,
+    generate_compact_lattice,
+    generate_lattice,
+    generate_row_blocks,
+    hoshen_kopelman,
+    hoshen_kopelman_fast,
+    hoshen_kopelman_stream,
+)
+
+# name -> (function of (lattice, L, p), largest L it is run for or None)
+BENCHMARKS = {
+    "generate_lattice": (lambda lattice, L, p: generate_lattice(L, p), None),
+    "generate_compact_lattice": (
+        lambda lattice, L, p: generate_compact_lattice(L, p),
+        None,
+    ),
+    "generate_compact_lattice_packed": (
+        lambda lattice, L, p: generate_compact_lattice(L, p, packed=True),
+        None,
+    ),
+    "burning_method": (
+        lambda lattice, L, p: burning_method(lattice, record_times=False),
+        None,
+    ),
+    "burning_method_times": (lambda lattice, L, p: burning_method(lattice), None),
+    "burning_method_dfs": (
+        lambda lattice, L, p: percolation_old.burning_method(lattice),
+        1000,
+    ),
+    "analyse_lattice": (lambda lattice, L, p: analyse_lattice(lattice), None),
+    "hoshen_kopelman": (lambda lattice, L, p: hoshen_kopelman(lattice), 500),
+    "hoshen_kopelman_old": (
+        lambda lattice, L, p: percolation_old.hoshen_kopelman(lattice),
+        500,
+    ),
+    "hoshen_kopelman_fast": (
+        lambda lattice, L, p: hoshen_kopelman_fast(lattice),
+        None,
+    ),
+    "hoshen_kopelman_stream": (
+        lambda lattice, L, p: hoshen_kopelman_stream(generate_row_blocks(L, L, p)),
+        None,
+    ),
+}
+
+
+def time_call(func, repeats):
+    """Best wall-clock time of ``repeats`` calls, then one traced call for peak memory."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def fit_exponent(sizes, seconds):
+    """Slope of log(time) against log(L), or None with fewer than two points."""
+    if len(sizes) < 2:
+        return None
+    slope, _ = np.polyfit(np.log(sizes), np.log(seconds), 1)
+    return float(slope)
+
+
+def run_benchmarks(sizes, p_values, repeats=3, methods=None, seed=0):
+    methods = list(BENCHMARKS) if methods is None else methods
+    measurements = []
+
+    for L in sizes:
+        for p in p_values:
+            np.random.seed(seed)
+            lattice = generate_lattice(L, p)
+            for name in methods:
+                func, max_size = BENCHMARKS[name]
+                if max_size is not None and L > max_size:
+                    continue
+                seconds, peak = time_call(lambda: func(lattice, L, p), repeats)
+                measurements.append(
+                    {
+                        "method": name,
+                        "L": L,
+                        "p": p,
+                        "seconds": seconds,
+                        "sites_per_second": L * L / seconds,
+                        "peak_bytes": peak,
+                        "peak_bytes_per_site": peak / (L * L),
+                    }
+                )
+                print(
+                    f"{name:32s} L={L:6d} p={p:.4f} "
+                    f"{seconds:10.4f} s {L * L / seconds:12.3e} sites/s "
+                    f"{peak / 2**20:9.1f} MiB"
+                )
+
+    scaling = []
+    for name in methods:
+        for p in p_values:
+            points = [
+                m for m in measurements if m["method"] == name and m["p"] == p
+            ]
+            exponent = fit_exponent(
+                [m["L"] for m in points], [m["seconds"] for m in points]
+            )
+            scaling.append({"method": name, "p": p, "exponent": exponent})
+
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "repeats": repeats,
+        "seed": seed,
+        "measurements": measurements,
+        "scaling": scaling,
+    }
+
+
+def compare(report, baseline, tolerance=0.2):
+    """Print measurements that got more than ``tolerance`` slower than the baseline."""
+    previous = {
+        (m["method"], m["L"], m["p"]): m["seconds"] for m in baseline["measurements"]
+    }
+    regressions = []
+    for m in report["measurements"]:
+        before = previous.get((m["method"], m["L"], m["p"]))
+        if before is not None and m["seconds"] > (1 + tolerance) * before:
+            regressions.append(m)
+            print(
+                f"REGRESSION {m['method']} L={m['L']} p={m['p']}: "
+                f"{before:.4f} s -> {m['seconds']:.4f} s"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the percolation engines")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[64, 128, 256, 512, 1024]
+    )
+    parser.add_argument("--p", type=float, nargs="+", default=[0.4, 0.592746, 0.8])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--methods", nargs="+", choices=list(BENCHMARKS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.sizes, args.p, args.repeats, args.methods, args.seed)
+    for row in report["scaling"]:
+        if row["exponent"] is not None:
+            print(f"{row['method']:32s} p={row['p']:.4f} time ~ L^{row['exponent']:.2f}")
+
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            compare(report, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import os
+import pickle
+
+import numpy as np
+
+AVE_DTYPE = np.dtype([("p", "f8"), ("P_flow", "f8"), ("smax", "f8")])
+DIST_DTYPE = np.dtype([("p", "f8"), ("s", "i8"), ("count", "i8")])
+
+
+def checkpoint_filename(L, T):
+    return f"checkpoint-L{L}T{T}.pkl"
+
+
+def result_filenames(L, T):
+    return f"Ave-L{L}T{T}.bin", f"Dist-L{L}T{T}.bin"
+
+
+def save_checkpoint(filename, state):
+    """Atomically replace the checkpoint so a crash never leaves a torn file."""
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "wb") as file:
+        pickle.dump(state, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_filename, filename)
+
+
+def load_checkpoint(filename, params):
+    with open(filename, "rb") as file:
+        state = pickle.load(file)
+    if state["params"] != params:
+        raise ValueError(
+            f"Checkpoint {filename} was written for (L, T, p0, pk, dp) = "
+            f"{state['params']}, not {params}"
+        )
+    return state
+
+
+def result_offsets(L, T):
+    """Current sizes of the binary result files, stored with every checkpoint."""
+    return tuple(
+        os.path.getsize(name) if os.path.exists(name) else 0
+        for name in result_filenames(L, T)
+    )
+
+
+def truncate_results(L, T, offsets=(0, 0)):
+    """Drop results appended after the checkpoint that ``offsets`` belong to."""
+    for name, offset in zip(result_filenames(L, T), offsets):
+        with open(name, "ab") as file:
+            file.truncate(offset)
+
+
+def append_results(L, T, p, P_flow, smax_avg, cluster_distribution):
+    """Append the averages and the cluster distribution of one p value."""
+    ave_filename, dist_filename = result_filenames(L, T)
+    distribution = np.array(
+        [(p, s, count) for s, count in cluster_distribution.items()], dtype=DIST_DTYPE
+    )
+    for filename, records in [
+        (ave_filename, np.array([(p, P_flow, smax_avg)], dtype=AVE_DTYPE)),
+        (dist_filename, distribution),
+    ]:
+        with open(filename, "ab") as file:
+            records.tofile(file)
+            file.flush()
+            os.fsync(file.fileno())
+
+
+def read_results(L, T):
+    """Return the stored averages and a dict of per-p (s, count) records."""
+    ave_filename, dist_filename = result_filenames(L, T)
+    averages = np.fromfile(ave_filename, dtype=AVE_DTYPE)
+    records = np.fromfile(dist_filename, dtype=DIST_DTYPE)
+    distributions = {}
+    for p, s, count in records.tolist():
+        distributions.setdefault(p, []).append((s, count))
+    return averages, distributions
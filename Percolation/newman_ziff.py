@@ -0,0 +1,152 @@
+from collections import Counter
+
+import numpy as np
+from tqdm import tqdm
+
+from percolation import read_input, write_averages, write_distribution
+
+
+def p_decimals(dp):
+    """Number of decimals needed to tell neighbouring p values apart (at least 2)."""
+    decimals = 2
+    while decimals < 10 and abs(round(dp, decimals) - dp) > 1e-12:
+        decimals += 1
+    return decimals
+
+
+def newman_ziff_realization(L, record_n=()):
+    """Occupy the L x L lattice one site at a time in random order.
+
+    Clusters are merged incrementally with a union-find in which a root stores
+    minus the cluster size. Returns the number of occupied sites at which a
+    cluster first connects the top and bottom rows (``L * L + 1`` if none
+    does), the largest cluster size after each of the ``L * L + 1`` steps, and
+    the cluster size distribution at every occupation number in ``record_n``.
+    """
+    N = L * L
+    empty = N + 1
+    parent = [empty] * N
+    # Bit 1 marks clusters touching the top row, bit 2 the bottom row.
+    edges = [0] * N
+    sizes = Counter()
+    record_n = set(record_n)
+    snapshots = {}
+    smax = [0] * (N + 1)
+    spanning_n = N + 1
+    largest = 0
+
+    def find(x):
+        root = x
+        while parent[root] >= 0:
+            root = parent[root]
+        while parent[x] >= 0:  # Path compression
+            parent[x], x = root, parent[x]
+        return root
+
+    if 0 in record_n:
+        snapshots[0] = Counter()
+
+    for n, site in enumerate(np.random.permutation(N).tolist(), start=1):
+        i, j = divmod(site, L)
+        parent[site] = -1
+        edges[site] = (i == 0) | ((i == L - 1) << 1)
+        sizes[1] += 1
+        root = site
+
+        for ni, nj in [(i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)]:
+            if 0 <= ni < L and 0 <= nj < L:
+                neighbor = ni * L + nj
+                if parent[neighbor] == empty:
+                    continue
+                other = find(neighbor)
+                if other == root:
+                    continue
+                s_root, s_other = -parent[root], -parent[other]
+                if s_root < s_other:
+                    root, other = other, root
+                    s_root, s_other = s_other, s_root
+                parent[root] -= s_other
+                parent[other] = root
+                edges[root] |= edges[other]
+                for s in (s_root, s_other):
+                    sizes[s] -= 1
+                    if not sizes[s]:
+                        del sizes[s]
+                sizes[s_root + s_other] += 1
+
+        largest = max(largest, -parent[root])
+        smax[n] = largest
+        if spanning_n > N and edges[root] == 3:
+            spanning_n = n
+        if n in record_n:
+            snapshots[n] = Counter(sizes)
+
+    return spanning_n, smax, snapshots
+
+
+def binomial_weights(N, p):
+    """Probability of n = 0..N occupied sites when each of N sites is occupied with p."""
+    weights = np.zeros(N + 1)
+    if p <= 0:
+        weights[0] = 1.0
+        return weights
+    if p >= 1:
+        weights[N] = 1.0
+        return weights
+    log_factorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, N + 1)))))
+    n = np.arange(N + 1)
+    log_weights = (
+        log_factorial[N]
+        - log_factorial
+        - log_factorial[::-1]
+        + n * np.log(p)
+        + (N - n) * np.log1p(-p)
+    )
+    weights = np.exp(log_weights - log_weights.max())
+    return weights / weights.sum()
+
+
+def newman_ziff_simulation(L, T, p0, pk, dp):
+    """Newman-Ziff counterpart of ``monte_carlo_simulation``.
+
+    Every realization sweeps all occupation numbers at once, so the cost no
+    longer depends on how many p values are requested. P_flow and <smax> are
+    averaged over the binomial distribution of occupied sites (canonical
+    ensemble); the cluster distributions are taken at n = round(p * L * L).
+    """
+    N = L * L
+    p_values = np.arange(p0, pk + dp, dp)
+    record_n = np.clip(np.rint(p_values * N), 0, N).astype(int)
+
+    spanning_count = np.zeros(N + 2)
+    smax_total = np.zeros(N + 1)
+    distributions = {n: Counter() for n in record_n.tolist()}
+
+    for _ in tqdm(range(T), desc="Newman-Ziff sweeps"):
+        spanning_n, smax, snapshots = newman_ziff_realization(L, distributions.keys())
+        spanning_count[spanning_n] += 1
+        smax_total += smax
+        for n, sizes in snapshots.items():
+            distributions[n].update(sizes)
+
+    P_flow_n = np.cumsum(spanning_count)[: N + 1] / T
+    smax_n = smax_total / T
+
+    decimals = p_decimals(dp)
+    results = []
+    for p, n in zip(p_values, record_n.tolist()):
+        weights = binomial_weights(N, p)
+        results.append((p, weights @ P_flow_n, weights @ smax_n))
+
+        write_distribution(p, L, T, distributions[n], decimals)
+
+    write_averages(L, T, results)
+
+
+def main():
+    L, T, p0, pk, dp = read_input("perc-ini.txt")
+    newman_ziff_simulation(L, T, p0, pk, dp)
+
+
+if __name__ == "__main__":
+    main()
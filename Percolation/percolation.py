@@ -1,9 +1,20 @@
+import argparse
+import os
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 from tqdm import tqdm
 
-from percolation_old import burning_method as burning_method_dfs
+from checkpoint import (
+    append_results,
+    checkpoint_filename,
+    load_checkpoint,
+    read_results,
+    result_offsets,
+    save_checkpoint,
+    truncate_results,
+)
 
 
 def read_input(filename):
@@ -17,42 +28,155 @@ def read_input(filename):
     return L, T, p0, pk, dp
 
 
-def generate_lattice(size, p):
-    lattice = np.random.rand(size, size) < p
+def generate_lattice(size, p, rng=None):
+    if rng is None:
+        lattice = np.random.rand(size, size) < p
+    else:
+        lattice = rng.random((size, size)) < p
     return lattice.astype(int)
 
 
-def burning_method(lattice):
-    L = lattice.shape[0]
-    labels = np.zeros_like(lattice, dtype=int)
+class PackedLattice:
+    """Occupancy lattice stored with one bit per site, packed along rows.
+
+    Indexing with a row or a slice of rows unpacks just those rows to uint8,
+    which is all the labelling and burning routines need.
+    """
+
+    def __init__(self, bits, cols):
+        self.bits = bits
+        self.shape = (bits.shape[0], cols)
+
+    def __getitem__(self, rows):
+        return np.unpackbits(self.bits[rows], axis=-1, count=self.shape[1])
+
+    def __array__(self, dtype=None, copy=None):
+        lattice = self[:]
+        return lattice if dtype is None else lattice.astype(dtype)
+
+
+def default_block_rows(cols):
+    # Rows per block so that a block holds about 2**18 sites
+    return max(1, (1 << 18) // max(cols, 1))
+
+
+def generate_compact_lattice(
+    size, p, rng=None, packed=False, memmap_path=None, block_rows=None
+):
+    """Memory-lean ``generate_lattice``.
+
+    Random numbers are drawn one block of rows at a time and occupancy is
+    stored as uint8 (1 byte per site) or, with ``packed``, as a
+    ``PackedLattice`` (1 bit per site). With ``memmap_path`` the storage is a
+    ``np.memmap`` file, so lattices larger than RAM can be generated.
+
+    ``analyse_lattice`` and ``hoshen_kopelman_stream`` (via ``row_blocks``)
+    read such a lattice one block of rows at a time. ``hoshen_kopelman_fast``
+    and ``burning_method`` also accept it, but build full-size label and
+    burn arrays in memory.
+    """
+    random = np.random.random_sample if rng is None else rng.random
+    cols = (size + 7) // 8 if packed else size
+    if memmap_path is None:
+        data = np.empty((size, cols), dtype=np.uint8)
+    else:
+        data = np.memmap(memmap_path, dtype=np.uint8, mode="w+", shape=(size, cols))
+    if block_rows is None:
+        block_rows = default_block_rows(size)
+
+    for r0 in range(0, size, block_rows):
+        block = random((min(block_rows, size - r0), size)) < p
+        data[r0 : r0 + len(block)] = np.packbits(block, axis=1) if packed else block
+
+    return PackedLattice(data, size) if packed else data
+
+
+def row_blocks(lattice, block_rows=None):
+    """Yield the lattice one block of rows at a time, for ``hoshen_kopelman_stream``."""
+    rows, cols = lattice.shape
+    if block_rows is None:
+        block_rows = default_block_rows(cols)
+    for r0 in range(0, rows, block_rows):
+        yield lattice[r0 : r0 + block_rows]
+
+
+SMALL_FRONTIER = 32  # Below this many sites a burn step is done in plain Python
+
+
+def burning_method(lattice, record_times=True, early_exit=True, block_rows=None):
+    """Burn the lattice from the top row and report whether fire reaches the bottom.
+
+    Breadth-first search in which the burning front is kept as an array of
+    flat site indices, so each site is visited once instead of rescanning the
+    lattice every step. A front of fewer than ``SMALL_FRONTIER`` sites is
+    advanced with a plain Python loop instead, because the fixed cost of the
+    array calls would dominate on long, thin paths such as a winding
+    corridor. With ``record_times`` the burn times are returned in ``labels``
+    (top row = 2, so the shortest path to the bottom row is the bottom-row
+    burn time minus 2) and the result is ``(spans, labels)``; otherwise only
+    ``spans`` is returned. With ``early_exit`` burning stops at the step that
+    first reaches the bottom row. The lattice is read a block of rows at a
+    time but copied into an in-memory bool array, so a memory-mapped lattice
+    must still fit in RAM.
+    """
+    rows, cols = lattice.shape
+    width = cols + 2
+    # Pad with an empty border so neighbours never need bounds checks
+    unburnt = np.zeros((rows + 2, width), dtype=bool)
+    if block_rows is None:
+        block_rows = default_block_rows(cols)
+    for r0 in range(0, rows, block_rows):
+        block = np.asarray(lattice[r0 : r0 + block_rows])
+        unburnt[r0 + 1 : r0 + 1 + len(block), 1:-1] = block != 0
+    unburnt = unburnt.ravel()
+    offsets = np.array([-width, width, -1, 1])
+    bottom_row = rows * width
+
+    # Burn times on the padded grid; the memoryviews serve the Python steps
+    times = np.zeros(unburnt.size, dtype=int) if record_times else None
+    unburnt_view = memoryview(unburnt.view(np.uint8))
+    times_view = memoryview(times) if record_times else None
+
+    frontier = np.flatnonzero(unburnt[width : 2 * width]) + width
+    unburnt[frontier] = False
+    spans = False
     t = 2
 
-    for j in range(L):
-        if lattice[0, j] == 1:
-            labels[0, j] = t
-
-    while True:
-        new_burning = False
-        for i in range(L):
-            for j in range(L):
-                if labels[i, j] == t:
-                    for ni, nj in [(i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)]:
-                        if (
-                            0 <= ni < L
-                            and 0 <= nj < L
-                            and lattice[ni, nj] == 1
-                            and labels[ni, nj] == 0
-                        ):  # Check for boundary conditions and occupancy
-                            labels[ni, nj] = t + 1
-                            new_burning = True
-                            if ni == L - 1:
-                                return True, labels
-
-        if not new_burning:
-            break
+    while len(frontier):
+        small = len(frontier) < SMALL_FRONTIER
+        if small:
+            frontier = list(map(int, frontier))
+            if record_times:
+                for site in frontier:
+                    times_view[site] = t
+            deepest = max(frontier)
+        else:
+            frontier = np.asarray(frontier)
+            if record_times:
+                times[frontier] = t
+            deepest = frontier.max()
+        if not spans and deepest >= bottom_row:
+            spans = True
+            if early_exit:
+                break
+
+        if small:
+            burning = []
+            for site in frontier:
+                for neighbour in (site - width, site + width, site - 1, site + 1):
+                    if unburnt_view[neighbour]:
+                        unburnt_view[neighbour] = 0
+                        burning.append(neighbour)
+            frontier = burning
+        else:
+            neighbours = (frontier[:, None] + offsets).ravel()
+            frontier = np.unique(neighbours[unburnt[neighbours]])
+            unburnt[frontier] = False
         t += 1
 
-    return False, labels
+    if record_times:
+        return spans, times.reshape(rows + 2, width)[1:-1, 1:-1]
+    return spans
 
 
 def hoshen_kopelman(lattice, update_labels=False):
@@ -112,47 +236,411 @@ def hoshen_kopelman(lattice, update_labels=False):
     return labels, cluster_sizes
 
 
-def monte_carlo_simulation(L, T, p0, pk, dp):
+def _connect(parent, u, v):
+    # Hook roots onto the smaller neighbouring root, then compress every path
+    # so that parent[x] is always the root of x between rounds.
+    while True:
+        ru, rv = parent[u], parent[v]
+        merge = ru != rv
+        if not merge.any():
+            return parent
+        lo = np.minimum(ru[merge], rv[merge])
+        hi = np.maximum(ru[merge], rv[merge])
+        np.minimum.at(parent, hi, lo)
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+
+def hoshen_kopelman_fast(lattice, update_labels=True, block_rows=None):
+    """Array-native Hoshen-Kopelman labelling.
+
+    Horizontal runs of occupied sites are labelled for a block of rows at a
+    time, runs touching vertically are merged with a union-find kept in flat
+    ``parent``/``size`` arrays, and paths are compressed after every merge.
+    Returns the same ``(labels, cluster_sizes)`` pair as ``hoshen_kopelman``,
+    with each cluster labelled by its smallest label (starting from 2).
+    Accepts int, uint8, memory-mapped and ``PackedLattice`` lattices, and
+    labels are int32 whenever the lattice is small enough. The labels are
+    always an in-memory array of the full lattice size.
+    """
+    rows, cols = lattice.shape
+    if block_rows is None:
+        block_rows = default_block_rows(cols)
+
+    max_labels = 2 + rows * ((cols + 1) // 2)
+    dtype = np.int32 if max_labels < np.iinfo(np.int32).max else np.int64
+    labels = np.zeros((rows, cols), dtype=dtype)
+    parent = np.arange(2 + cols, dtype=dtype)
+    size = np.zeros(2 + cols, dtype=dtype)
+    next_label = 2
+    prev_row = np.zeros(cols, dtype=dtype)
+
+    for r0 in range(0, rows, block_rows):
+        occupied = np.asarray(lattice[r0 : r0 + block_rows]) != 0
+
+        # Label horizontal runs: a run starts at an occupied site whose left
+        # neighbour is empty.
+        starts = occupied.copy()
+        starts[:, 1:] &= ~occupied[:, :-1]
+        run_ids = np.cumsum(starts.ravel()).reshape(occupied.shape)
+        n_runs = int(run_ids[-1, -1])
+        block = np.where(occupied, run_ids + (next_label - 1), 0).astype(dtype)
+
+        if next_label + n_runs > len(parent):
+            capacity = min(max(3 * len(parent) // 2, next_label + n_runs), max_labels)
+            parent = np.concatenate(
+                (parent, np.arange(len(parent), capacity, dtype=dtype))
+            )
+            size = np.concatenate((size, np.zeros(capacity - len(size), dtype)))
+        size[next_label : next_label + n_runs] = np.bincount(
+            run_ids[occupied], minlength=n_runs + 1
+        )[1:]
+        next_label += n_runs
+
+        # Runs stacked on top of each other belong to the same cluster.
+        upper = np.vstack((parent[prev_row][None, :], block[:-1]))
+        touching = (upper > 0) & (block > 0)
+        if touching.any():
+            pairs = np.unique(
+                upper[touching].astype(np.int64) * next_label + block[touching]
+            )
+            u, v = np.divmod(pairs, next_label)
+            ids, local = np.unique(np.concatenate((u, v)), return_inverse=True)
+            local_parent = _connect(
+                np.arange(len(ids)), local[: len(u)], local[len(u) :]
+            )
+            merged = np.bincount(local_parent, weights=size[ids], minlength=len(ids))
+            parent[ids] = ids[local_parent]
+            size[ids] = merged.astype(dtype)
+
+        labels[r0 : r0 + block_rows] = block
+        prev_row = block[-1]
+
+    parent = parent[:next_label]
+    while True:
+        grandparent = parent[parent]
+        if np.array_equal(grandparent, parent):
+            break
+        parent = grandparent
+
+    if update_labels:
+        for r0 in range(0, rows, block_rows):
+            labels[r0 : r0 + block_rows] = parent[labels[r0 : r0 + block_rows]]
+
+    roots = np.flatnonzero(parent[2:] == np.arange(2, next_label, dtype=dtype)) + 2
+    sizes, counts = np.unique(size[roots], return_counts=True)
+    cluster_sizes = Counter(dict(zip(sizes.tolist(), counts.tolist())))
+
+    return labels, cluster_sizes
+
+
+def generate_row_blocks(cols, rows, p, rng=None, block_rows=None):
+    """Yield a rows x cols occupancy lattice one block of rows at a time."""
+    random = np.random.random_sample if rng is None else rng.random
+    if block_rows is None:
+        block_rows = default_block_rows(cols)
+    for r0 in range(0, rows, block_rows):
+        yield random((min(block_rows, rows - r0), cols)) < p
+
+
+def hoshen_kopelman_stream(row_blocks):
+    """Hoshen-Kopelman labelling that never holds more than one block of rows.
+
+    ``row_blocks`` is any iterable of rows or blocks of rows, e.g. a lattice
+    or ``generate_row_blocks``. Only the labels of the last row seen and the
+    union-find table of the clusters that still reach it are kept; clusters
+    that stop growing are moved into the size histogram and their labels are
+    recycled, so memory is O(cols) however many rows are streamed. Returns
+    ``(spans, cluster_sizes)``, where ``spans`` tells whether a cluster
+    touching the first row also touches the last one.
+    """
+    cluster_sizes = Counter()
+    prev_row = None
+    # Label 0 marks empty sites; live clusters are relabelled 1..n after every block
+    size = np.zeros(1, dtype=np.int64)
+    top = np.zeros(1, dtype=bool)
+
+    for block in row_blocks:
+        occupied = np.atleast_2d(np.asarray(block)) != 0
+        first_block = prev_row is None
+        if first_block:
+            prev_row = np.zeros(occupied.shape[1], dtype=np.int64)
+
+        starts = occupied.copy()
+        starts[:, 1:] &= ~occupied[:, :-1]
+        run_ids = np.cumsum(starts.ravel()).reshape(occupied.shape)
+        n_runs = int(run_ids[-1, -1])
+        labels = np.where(occupied, run_ids + (len(size) - 1), 0)
+
+        new_top = np.zeros(n_runs, dtype=bool)
+        if first_block:
+            new_top[: run_ids[0, -1]] = True
+        size = np.concatenate(
+            (size, np.bincount(run_ids[occupied], minlength=n_runs + 1)[1:])
+        )
+        top = np.concatenate((top, new_top))
+
+        upper = np.vstack((prev_row[None, :], labels[:-1]))
+        touching = (upper > 0) & (labels > 0)
+        parent = _connect(np.arange(len(size)), upper[touching], labels[touching])
+        size = np.bincount(parent, weights=size, minlength=len(size)).astype(np.int64)
+        top = np.bincount(parent, weights=top, minlength=len(size)) > 0
+
+        # Clusters that no longer reach the last row are complete
+        last_row = parent[labels[-1]]
+        live = np.zeros(len(size), dtype=bool)
+        live[last_row] = True
+        live[0] = False
+        done = (parent == np.arange(len(size))) & ~live
+        done[0] = False
+        sizes, counts = np.unique(size[done], return_counts=True)
+        cluster_sizes.update(dict(zip(sizes.tolist(), counts.tolist())))
+
+        live_ids = np.flatnonzero(live)
+        remap = np.zeros(len(size), dtype=np.int64)
+        remap[live_ids] = np.arange(1, len(live_ids) + 1)
+        prev_row = remap[last_row]
+        size = np.concatenate(([0], size[live_ids]))
+        top = np.concatenate(([False], top[live_ids]))
+
+    # Whatever is still live touches the last row
+    sizes, counts = np.unique(size[1:], return_counts=True)
+    cluster_sizes.update(dict(zip(sizes.tolist(), counts.tolist())))
+    spans = bool(top[1:].any())
+
+    return spans, cluster_sizes
+
+
+def analyse_lattice(lattice):
+    """Spanning flag, largest cluster size and cluster size histogram in one pass.
+
+    A cluster spans when its label appears in both the top and the bottom row
+    of the Hoshen-Kopelman labels, so no separate burning pass is needed.
+    Memory-mapped and packed lattices are streamed through
+    ``hoshen_kopelman_stream`` instead, so no array of the full lattice size
+    is ever built for them.
+    """
+    if isinstance(lattice, (np.memmap, PackedLattice)):
+        spans, cluster_sizes = hoshen_kopelman_stream(row_blocks(lattice))
+        return spans, max(cluster_sizes.keys(), default=0), cluster_sizes
+
+    labels, cluster_sizes = hoshen_kopelman_fast(lattice)
+    top = labels[0][labels[0] > 0]
+    spans = bool(np.intersect1d(top, labels[-1]).size)
+    smax = max(cluster_sizes.keys(), default=0)
+    return spans, smax, cluster_sizes
+
+
+def write_distribution(p, L, T, cluster_distribution, decimals=2):
+    dist_filename = f"Dist-p{p:.{decimals}f}L{L}T{T}.txt"
+    with open(dist_filename, "w") as file:
+        for s, count in cluster_distribution.items():
+            if s > 0:
+                file.write(f"{s}  {count}\n")
+
+
+def write_averages(L, T, results):
+    results_filename = f"Ave-L{L}T{T}.txt"
+    with open(results_filename, "w") as file:
+        for p, P_flow, smax_avg in results:
+            file.write(f"{p}  {P_flow}  {smax_avg}\n")
+
+
+def export_results(L, T, decimals=2):
+    """Write the text Ave/Dist files from the binary results of a checkpointed run."""
+    averages, distributions = read_results(L, T)
+    for p in averages["p"].tolist():
+        write_distribution(p, L, T, dict(distributions.get(p, [])), decimals)
+    write_averages(L, T, averages.tolist())
+
+
+def monte_carlo_simulation(
+    L, T, p0, pk, dp, fast_hk=True, fused=True, checkpoint_every=None, resume=False
+):
+    """Estimate P_flow, <smax> and the cluster distribution for each p.
+
+    With ``checkpoint_every`` the accumulated totals and the RNG state are
+    saved every that many trials, results are appended to binary files as
+    each p finishes, and the text files are exported at the end. ``resume``
+    picks up from the last checkpoint of an interrupted run, and needs
+    ``checkpoint_every``: the results of the finished p values are only in
+    the binary files.
+    """
+    if resume and not checkpoint_every:
+        raise ValueError(
+            "resume needs checkpoint_every, the results so far are in its binary files"
+        )
     p_values = np.arange(p0, pk + dp, dp)
     results = []
-
-    for p in tqdm(p_values, desc="Overall Progress"):
+    labelling = hoshen_kopelman_fast if fast_hk else hoshen_kopelman
+
+    checkpoint_path = checkpoint_filename(L, T)
+    state = {"p_index": 0, "trial": 0, "offsets": (0, 0)}
+    if resume and os.path.exists(checkpoint_path):
+        state = load_checkpoint(checkpoint_path, (L, T, p0, pk, dp))
+        np.random.set_state(state["rng_state"])
+    if checkpoint_every:
+        truncate_results(L, T, state["offsets"])
+
+    def checkpoint(p_index, trial, P_flow, smax_total, cluster_distribution):
+        save_checkpoint(
+            checkpoint_path,
+            {
+                "params": (L, T, p0, pk, dp),
+                "p_index": p_index,
+                "trial": trial,
+                "P_flow": P_flow,
+                "smax_total": smax_total,
+                "cluster_distribution": cluster_distribution,
+                "rng_state": np.random.get_state(),
+                "offsets": result_offsets(L, T),
+            },
+        )
+
+    for p_index, p in enumerate(tqdm(p_values, desc="Overall Progress")):
+        if p_index < state["p_index"]:
+            continue
         P_flow = 0
         smax_total = 0
         cluster_distribution = Counter()
-
-        for _ in tqdm(range(T), desc=f"Simulating for p={p:.2f}", leave=False):
+        first_trial = 0
+        if p_index == state["p_index"] and state["trial"]:
+            P_flow = state["P_flow"]
+            smax_total = state["smax_total"]
+            cluster_distribution = state["cluster_distribution"]
+            first_trial = state["trial"]
+
+        for trial in tqdm(
+            range(first_trial, T), desc=f"Simulating for p={p:.2f}", leave=False
+        ):
             lattice = generate_lattice(L, p)
-            P_flow += burning_method_dfs(lattice)
-            _, cluster_sizes = hoshen_kopelman(lattice)
-
-            smax_total += max(
-                cluster_sizes.keys()
-            )  # Find the size of the largest cluster
+            if fused:
+                spans, smax, cluster_sizes = analyse_lattice(lattice)
+            else:  # Separate burning and labelling passes, kept for validation
+                spans = burning_method(lattice, record_times=False)
+                _, cluster_sizes = labelling(lattice)
+                smax = max(
+                    cluster_sizes.keys()
+                )  # Find the size of the largest cluster
+
+            P_flow += spans
+            smax_total += smax
 
             cluster_distribution.update(
                 cluster_sizes
             )  # Update the cluster size distribution
 
+            if checkpoint_every and (trial + 1) % checkpoint_every == 0:
+                checkpoint(p_index, trial + 1, P_flow, smax_total, cluster_distribution)
+
         P_flow /= T
         smax_avg = smax_total / T
-        results.append((p, P_flow, smax_avg))
+        if checkpoint_every:
+            append_results(L, T, p, P_flow, smax_avg, cluster_distribution)
+            checkpoint(p_index + 1, 0, 0, 0, Counter())
+        else:
+            results.append((p, P_flow, smax_avg))
+            write_distribution(p, L, T, cluster_distribution)
+
+    if checkpoint_every:
+        export_results(L, T)
+        os.remove(checkpoint_path)
+    else:
+        write_averages(L, T, results)
+
+
+def simulate_batch(L, p, seed, p_index, trials):
+    """Run the given trials for one p value and return their summed statistics.
+
+    Every trial draws its lattice from its own generator, seeded from
+    ``(seed, p_index, trial)``, so the outcome does not depend on how trials
+    are grouped into batches or spread over workers.
+    """
+    P_flow = 0
+    smax_total = 0
+    cluster_distribution = Counter()
+
+    for trial in trials:
+        rng = np.random.default_rng(
+            np.random.SeedSequence(seed, spawn_key=(p_index, trial))
+        )
+        spans, smax, cluster_sizes = analyse_lattice(generate_lattice(L, p, rng))
+        P_flow += spans
+        smax_total += smax
+        cluster_distribution.update(cluster_sizes)
+
+    return p_index, P_flow, smax_total, cluster_distribution
+
+
+def parallel_monte_carlo_simulation(
+    L, T, p0, pk, dp, seed=0, workers=None, batch_size=None
+):
+    """Process-pool version of ``monte_carlo_simulation``.
+
+    The (p, trial) grid is cut into batches of ``batch_size`` trials that are
+    run across ``workers`` processes. Only integer sums and Counters are
+    merged, so for a given seed the output files are identical whatever the
+    number of workers or the batch size.
+    """
+    p_values = np.arange(p0, pk + dp, dp)
+    P_flow = [0] * len(p_values)
+    smax_total = [0] * len(p_values)
+    cluster_distributions = [Counter() for _ in p_values]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if batch_size is None:
+        batch_size = max(1, T // (4 * workers))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                simulate_batch,
+                L,
+                p,
+                seed,
+                p_index,
+                range(start, min(start + batch_size, T)),
+            )
+            for p_index, p in enumerate(p_values)
+            for start in range(0, T, batch_size)
+        ]
+        for future in tqdm(futures, desc="Overall Progress"):
+            p_index, batch_P_flow, batch_smax, batch_distribution = future.result()
+            P_flow[p_index] += batch_P_flow
+            smax_total[p_index] += batch_smax
+            cluster_distributions[p_index].update(batch_distribution)
 
-        dist_filename = f"Dist-p{p:.2f}L{L}T{T}.txt"
-        with open(dist_filename, "w") as file:
-            for s, count in cluster_distribution.items():
-                if s > 0:
-                    file.write(f"{s}  {count}\n")
+    results = []
+    for p_index, p in enumerate(p_values):
+        results.append((p, P_flow[p_index] / T, smax_total[p_index] / T))
+        write_distribution(p, L, T, cluster_distributions[p_index])
 
-    results_filename = f"Ave-L{L}T{T}.txt"
-    with open(results_filename, "w") as file:
-        for p, P_flow, smax_avg in results:
-            file.write(f"{p}  {P_flow}  {smax_avg}\n")
+    write_averages(L, T, results)
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Site percolation Monte Carlo")
+    parser.add_argument(
+        "--resume", action="store_true", help="continue from the last checkpoint"
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=100,
+        help="trials between checkpoints (0 disables checkpointing)",
+    )
+    args = parser.parse_args()
+    if args.resume and not args.checkpoint_every:
+        parser.error("--resume needs --checkpoint-every to be positive")
+
     L, T, p0, pk, dp = read_input("perc-ini.txt")
-    monte_carlo_simulation(L, T, p0, pk, dp)
+    monte_carlo_simulation(
+        L, T, p0, pk, dp, checkpoint_every=args.checkpoint_every, resume=args.resume
+    )
 
 
 if __name__ == "__main__":
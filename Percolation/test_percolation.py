@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from percolation import hoshen_kopelman, hoshen_kopelman_fast
+
+
+def random_lattices():
+    rng = np.random.default_rng(2024)
+    for L in (1, 2, 7, 31, 64):
+        yield np.zeros((L, L), dtype=int)
+        yield np.ones((L, L), dtype=int)
+        for p in (0.1, 0.3, 0.5, 0.5927, 0.7, 0.9):
+            yield (rng.random((L, L)) < p).astype(int)
+
+
+def same_partition(labels, expected):
+    # Empty sites agree, and labels map one-to-one between the two labellings
+    occupied = expected > 0
+    if not np.array_equal(labels > 0, occupied):
+        return False
+    pairs = np.unique(np.column_stack([labels[occupied], expected[occupied]]), axis=0)
+    return len(pairs) == len(np.unique(pairs[:, 0])) == len(np.unique(pairs[:, 1]))
+
+
+@pytest.mark.parametrize("block_rows", [None, 1, 2, 5])
+def test_hoshen_kopelman_fast_matches_reference(block_rows):
+    for lattice in random_lattices():
+        expected_labels, expected_sizes = hoshen_kopelman(lattice, update_labels=True)
+        labels, sizes = hoshen_kopelman_fast(
+            lattice, update_labels=True, block_rows=block_rows
+        )
+        assert sizes == expected_sizes
+        assert same_partition(labels, expected_labels)
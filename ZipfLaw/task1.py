@@ -2,6 +2,11 @@ import string
 import os
 import pandas as pd
 from collections import Counter
+from operator import methodcaller
+
+STRIP_CHARS = string.punctuation + "[]{}()<>"
+CHUNK_SIZE = 1 << 20  # Characters read at a time when streaming a file
+strip_word = methodcaller("strip", STRIP_CHARS)
 
 
 def read_file_to_word_list(file_path):
@@ -26,11 +31,41 @@ def clean_word_list(word_list):
     """
     cleaned_words = []
     for word in word_list:
-        cleaned_word = word.strip(string.punctuation + "[]{}()<>").lower()
+        cleaned_word = word.strip(STRIP_CHARS).lower()
         cleaned_words.append(cleaned_word)
     return cleaned_words
 
 
+def count_words_in_file(file_path, chunk_size=CHUNK_SIZE):
+    """
+    Counts the cleaned words of a text file, reading it in chunks.
+
+    A word cut by the end of a chunk is carried over to the next one, so the
+    counts, and their first-occurrence order, are the same as
+    Counter(clean_word_list(read_file_to_word_list(file_path))) while memory
+    only grows with the vocabulary.
+
+    :param file_path: Path to the text file.
+    :param chunk_size: Number of characters read at a time.
+    :return: Counter of cleaned words.
+    """
+    word_counts = Counter()
+    carry = ""
+    with open(file_path, "r", encoding="utf-8") as file:
+        while True:
+            chunk = file.read(chunk_size)
+            text = carry + chunk
+            cut = len(text)
+            if chunk:
+                while cut and not text[cut - 1].isspace():
+                    cut -= 1
+            # Lowercase whole words only, so context-dependent mappings see the same word
+            word_counts.update(map(strip_word, text[:cut].lower().split()))
+            carry = text[cut:]
+            if not chunk:
+                return word_counts
+
+
 def construct_word_dataframe(cleaned_word_list):
     """
     Constructs a pandas DataFrame with word rank, word, count, and frequency.
@@ -38,7 +73,16 @@ def construct_word_dataframe(cleaned_word_list):
     :param cleaned_word_list: List of cleaned words.
     :return: DataFrame with columns: 'Rank', 'Word', 'Count', 'Frequency'.
     """
-    word_counts = Counter(cleaned_word_list)
+    return construct_word_dataframe_from_counts(Counter(cleaned_word_list))
+
+
+def construct_word_dataframe_from_counts(word_counts):
+    """
+    Constructs the same DataFrame as construct_word_dataframe from word counts.
+
+    :param word_counts: Counter of cleaned words.
+    :return: DataFrame with columns: 'Rank', 'Word', 'Count', 'Frequency'.
+    """
     total_words = sum(word_counts.values())
 
     word_data = []
@@ -74,10 +118,9 @@ def process_files(files_dir, output_dir):
     files = [f for f in os.listdir(files_dir) if f.endswith(".txt")]
 
     for file_name in files:
-        words = read_file_to_word_list(f"{files_dir}/{file_name}")
-        cleaned_words = clean_word_list(words)
-        stats_df = construct_word_dataframe(cleaned_words)
-        word_count = get_word_count(cleaned_words)
+        word_counts = count_words_in_file(f"{files_dir}/{file_name}")
+        stats_df = construct_word_dataframe_from_counts(word_counts)
+        word_count = sum(word_counts.values())
         export_dataframe_to_csv(
             stats_df, f"{output_dir}/{file_name[:-4]}_{word_count}.csv"
         )